@@ -0,0 +1,30 @@
+# Generated by Django 4.2.7 on 2026-10-17 19:11
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hangouts', '0011_archivedhangout_archivedmemoryphoto'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('chat', '0004_privatemessage'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedChat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('message_text', models.TextField()),
+                ('timestamp', models.DateTimeField()),
+                ('hangout', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='messages', to='hangouts.archivedhangout')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_chat_messages', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['timestamp'],
+            },
+        ),
+    ]
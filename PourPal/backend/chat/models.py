@@ -1,6 +1,6 @@
 from django.db import models
 from django.conf import settings
-from hangouts.models import Hangout
+from hangouts.models import Hangout, ArchivedHangout
 
 class Chat(models.Model):
     """
@@ -26,6 +26,29 @@ class Chat(models.Model):
     def __str__(self):
         return f"{self.user.first_name}: {self.message_text[:50]}"
 
+class ArchivedChat(models.Model):
+    """
+    Chat messages of an archived hangout.
+    """
+    hangout = models.ForeignKey(
+        ArchivedHangout,
+        on_delete=models.CASCADE,
+        related_name='messages'
+    )
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='archived_chat_messages'
+    )
+    message_text = models.TextField()
+    timestamp = models.DateTimeField()
+    
+    class Meta:
+        ordering = ['timestamp']
+    
+    def __str__(self):
+        return f"{self.user.first_name}: {self.message_text[:50]}"
+
 class PrivateMessage(models.Model):
     sender = models.ForeignKey(
         settings.AUTH_USER_MODEL,
@@ -1,5 +1,5 @@
 from rest_framework import serializers
-from .models import Chat, PrivateMessage
+from .models import Chat, PrivateMessage, ArchivedChat
 from users.serializers import UserSerializer
 
 
@@ -30,6 +30,13 @@ class ChatSerializer(serializers.ModelSerializer):
         return None
 
 
+class ArchivedChatSerializer(ChatSerializer):
+    """Chat message history of an archived hangout"""
+    
+    class Meta(ChatSerializer.Meta):
+        model = ArchivedChat
+
+
 class PrivateMessageSerializer(serializers.ModelSerializer):
     sender_name = serializers.CharField(source='sender.first_name', read_only=True)
     receiver_name = serializers.CharField(source='receiver.first_name', read_only=True)
@@ -0,0 +1,15 @@
+from django.dispatch import receiver
+from hangouts.signals import hangouts_archived
+from .models import Chat, ArchivedChat
+
+
+@receiver(hangouts_archived)
+def archive_chat_messages(sender, hangout_ids, **kwargs):
+    """Copy the chat history of archived hangouts before the hot rows are deleted"""
+    messages = Chat.objects.filter(hangout_id__in=hangout_ids).values(
+        'hangout_id', 'user_id', 'message_text', 'timestamp'
+    )
+    ArchivedChat.objects.bulk_create(
+        [ArchivedChat(**message) for message in messages.iterator()],
+        batch_size=1000
+    )
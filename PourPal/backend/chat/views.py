@@ -6,9 +6,9 @@ from django.views.decorators.csrf import csrf_exempt
 from django.utils.decorators import method_decorator
 from django.utils import timezone
 from django.db.models import Q
-from .models import Chat, PrivateMessage
-from .serializers import ChatSerializer, PrivateMessageSerializer, ConversationSerializer
-from hangouts.models import Hangout
+from .models import Chat, PrivateMessage, ArchivedChat
+from .serializers import ChatSerializer, ArchivedChatSerializer, PrivateMessageSerializer, ConversationSerializer
+from hangouts.models import Hangout, ArchivedHangout
 from users.models import User, Connection
 
 
@@ -19,6 +19,12 @@ class ChatMessageListView(generics.ListAPIView):
     """
     serializer_class = ChatSerializer
     permission_classes = [permissions.IsAuthenticated]
+    is_archived = False
+
+    def get_serializer_class(self):
+        if self.is_archived:
+            return ArchivedChatSerializer
+        return super().get_serializer_class()
 
     def get_queryset(self):
         hangout_id = self.kwargs['hangout_id']
@@ -26,11 +32,17 @@ class ChatMessageListView(generics.ListAPIView):
         # Check if user is a participant
         try:
             hangout = Hangout.objects.get(id=hangout_id)
-            if not hangout.participants.filter(id=self.request.user.id).exists():
-                raise PermissionDenied("You must be a participant to view this chat.")
         except Hangout.DoesNotExist:
-            raise PermissionDenied("Hangout not found.")
-        
+            hangout = ArchivedHangout.objects.filter(id=hangout_id).first()
+            if hangout is None:
+                raise PermissionDenied("Hangout not found.")
+        if not hangout.participants.filter(id=self.request.user.id).exists():
+            raise PermissionDenied("You must be a participant to view this chat.")
+        
+        if isinstance(hangout, ArchivedHangout):
+            # Serve the history copied out when the hangout was archived
+            self.is_archived = True
+            return ArchivedChat.objects.filter(hangout_id=hangout_id).select_related('user', 'user__profile')
         return Chat.objects.filter(hangout_id=hangout_id).select_related('user', 'user__profile')
 
 
@@ -9,7 +9,3 @@ class HangoutAdmin(admin.ModelAdmin):
     search_fields = ['title', 'venue_location', 'description', 'creator__email']
     ordering = ['-date_time']
     filter_horizontal = ['participants']
-    
-    def participant_count(self, obj):
-        return obj.participants.count()
-    participant_count.short_description = 'Participants'
@@ -1,6 +1,17 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
+
+
+def restore_search_triggers(sender, using, **kwargs):
+    """Altering hangouts_hangout on SQLite rebuilds it without the FTS triggers"""
+    from .search import ensure_sqlite_search_triggers
+    ensure_sqlite_search_triggers(using)
 
 
 class HangoutsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'hangouts'
+
+    def ready(self):
+        from . import signals  # noqa: F401
+        post_migrate.connect(restore_search_triggers, sender=self)
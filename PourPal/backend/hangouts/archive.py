@@ -0,0 +1,78 @@
+from datetime import timedelta
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from users.media import retain_media
+from .models import Hangout, HangoutMemoryPhoto, ArchivedHangout, ArchivedMemoryPhoto
+from .renditions import memory_photo_names
+from .signals import hangouts_archived
+
+DEFAULT_ARCHIVE_AFTER_DAYS = 30
+
+
+def archivable_hangouts(older_than_days=None):
+    """
+    Ended hangouts that ended, and took place, more than older_than_days ago.
+    A hangout ended ahead of its date is never archived before it is held.
+    """
+    if older_than_days is None:
+        older_than_days = getattr(settings, 'HANGOUT_ARCHIVE_AFTER_DAYS', DEFAULT_ARCHIVE_AFTER_DAYS)
+    cutoff = timezone.now() - timedelta(days=older_than_days)
+    return Hangout.objects.filter(is_ended=True, ended_at__lt=cutoff, date_time__lt=cutoff)
+
+
+@transaction.atomic
+def archive_batch(hangout_ids):
+    """
+    Move one batch of hangouts, with their participants, memory photos and
+    (through hangouts_archived) chat messages, into the archive tables.
+    """
+    hangouts = Hangout.objects.filter(id__in=hangout_ids).values(*ArchivedHangout.COPIED_FIELDS)
+    ArchivedHangout.objects.bulk_create(
+        [ArchivedHangout(**values) for values in hangouts],
+        ignore_conflicts=True
+    )
+    
+    memberships = Hangout.participants.through.objects.filter(hangout_id__in=hangout_ids)
+    ArchivedHangout.participants.through.objects.bulk_create([
+        ArchivedHangout.participants.through(archivedhangout_id=hangout_id, user_id=user_id)
+        for hangout_id, user_id in memberships.values_list('hangout_id', 'user_id')
+    ], ignore_conflicts=True)
+    
+    # Only the file reference moves; the image itself stays where it is
+    photos = HangoutMemoryPhoto.objects.filter(memory__hangout_id__in=hangout_ids)
+    archived_photos = ArchivedMemoryPhoto.objects.bulk_create([
+        ArchivedMemoryPhoto(
+            hangout_id=photo['memory__hangout_id'],
+            uploaded_by_id=photo['uploaded_by_id'],
+            image=photo['image'],
+            renditions=photo['renditions'],
+            caption=photo['caption'],
+            uploaded_at=photo['uploaded_at'],
+        )
+        for photo in photos.values(
+            'memory__hangout_id', 'uploaded_by_id', 'image', 'renditions', 'caption', 'uploaded_at'
+        )
+    ])
+    # bulk_create skips post_save; the hot rows release theirs when deleted below
+    retain_media(name for photo in archived_photos for name in memory_photo_names(photo))
+    
+    hangouts_archived.send(sender=Hangout, hangout_ids=hangout_ids)
+    
+    # Cascades to memberships, memories and chat messages in the hot tables
+    Hangout.objects.filter(id__in=hangout_ids).delete()
+    return len(hangout_ids)
+
+
+def archive_hangouts(older_than_days=None, batch_size=200):
+    """Archive every archivable hangout in batches; returns how many moved"""
+    archived = 0
+    while True:
+        ids = list(
+            archivable_hangouts(older_than_days)
+            .order_by('id')
+            .values_list('id', flat=True)[:batch_size]
+        )
+        if not ids:
+            return archived
+        archived += archive_batch(ids)
@@ -0,0 +1,140 @@
+import hashlib
+import json
+import time
+from datetime import date
+from math import ceil, isfinite
+from zoneinfo import ZoneInfo
+from django.core.cache import cache
+
+FEED_GENERATION_KEY = 'hangouts:feed:generation'
+PARTICIPANTS_VERSION_KEY = 'hangouts:{id}:participants:version'
+# Per-hangout versions may expire; a fresh one only costs clients a full response
+PARTICIPANTS_VERSION_TIMEOUT = 60 * 60 * 24 * 7
+
+# Radius searches share the hangouts around a ~1km grid cell
+GRID_DECIMALS = 2
+# Covers the half-diagonal of a cell (under 0.8km), so the hangouts cached for
+# a cell include those within the radius of any point in it
+GRID_MARGIN_KM = 1
+
+
+def _new_generation():
+    # Start from the clock so a counter lost to eviction never reuses old keys
+    return time.time_ns()
+
+
+def get_generation(key=FEED_GENERATION_KEY, timeout=None):
+    generation = cache.get(key)
+    if generation is None:
+        cache.add(key, _new_generation(), timeout=timeout)
+        generation = cache.get(key)
+    return generation
+
+
+def bump_generation(key=FEED_GENERATION_KEY, timeout=None):
+    """Invalidate every entry built under the current generation"""
+    try:
+        return cache.incr(key)
+    except ValueError:
+        cache.add(key, _new_generation(), timeout=timeout)
+        return cache.get(key)
+
+
+def get_participants_version(hangout_id):
+    return get_generation(
+        PARTICIPANTS_VERSION_KEY.format(id=hangout_id), PARTICIPANTS_VERSION_TIMEOUT
+    )
+
+
+def bump_participants_version(hangout_id):
+    return bump_generation(
+        PARTICIPANTS_VERSION_KEY.format(id=hangout_id), PARTICIPANTS_VERSION_TIMEOUT
+    )
+
+
+def _parse_date(value):
+    try:
+        return date.fromisoformat(value).isoformat()
+    except (TypeError, ValueError):
+        return None
+
+
+def _parse_timezone(value):
+    try:
+        ZoneInfo(value)
+    except (TypeError, ValueError, KeyError, OSError):
+        # ZoneInfoNotFoundError is a KeyError
+        return None
+    return value
+
+
+def make_etag(*parts):
+    """Build an ETag value from the inputs a response was derived from"""
+    return hashlib.sha1(
+        json.dumps(parts, sort_keys=True, default=str).encode()
+    ).hexdigest()
+
+
+def normalize_feed_params(params):
+    """
+    Reduce the feed query parameters to the canonical set that affects results.
+    Invalid location, date and timezone values are dropped, matching how the
+    feed ignores them. The location is kept exact; see grid_cell_params for
+    what radius searches share.
+    """
+    category = params.get('category')
+    # Accept snake_case or camelCase
+    start_date = _parse_date(params.get('start_date') or params.get('startDate'))
+    end_date = _parse_date(params.get('end_date') or params.get('endDate'))
+    normalized = {
+        'category': category if category and category != 'all' else None,
+        'start_date': start_date,
+        'end_date': end_date,
+        # Dates are days in the user's timezone; it only matters with a date filter
+        'tz': _parse_timezone(params.get('tz')) if start_date or end_date else None,
+        'available': params.get('available') in ('true', '1'),
+        'lat': None,
+        'lon': None,
+        'radius': None,
+        'cursor': params.get('cursor') or None,
+        'page_size': params.get('page_size') or None,
+        'fields': params.get('fields') or None,
+        'expand': params.get('expand') or None,
+    }
+
+    lat = params.get('lat')
+    lon = params.get('lon')
+    radius = params.get('radius')  # in km
+    if lat and lon and radius:
+        try:
+            lat, lon, radius = float(lat), float(lon), float(radius)
+        except (ValueError, TypeError):
+            return normalized
+        if all(isfinite(value) for value in (lat, lon, radius)):
+            normalized['lat'] = lat
+            normalized['lon'] = lon
+            normalized['radius'] = radius
+    return normalized
+
+
+def grid_cell_params(normalized):
+    """
+    Filters for the hangouts shared by radius searches from one grid cell:
+    the point snapped to the cell and the radius widened to cover the whole
+    cell. Paging and output shape are left out, as they apply per request.
+    """
+    cell = {
+        key: value for key, value in normalized.items()
+        if key not in ('cursor', 'page_size', 'fields', 'expand')
+    }
+    cell['lat'] = round(normalized['lat'], GRID_DECIMALS)
+    cell['lon'] = round(normalized['lon'], GRID_DECIMALS)
+    cell['radius'] = ceil(normalized['radius'] + GRID_MARGIN_KM)
+    return cell
+
+
+def feed_cache_key(normalized, kind='feed'):
+    digest = hashlib.sha1(
+        json.dumps(normalized, sort_keys=True).encode()
+    ).hexdigest()
+    return f'hangouts:{kind}:{get_generation()}:{digest}'
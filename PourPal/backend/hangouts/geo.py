@@ -0,0 +1,192 @@
+from math import radians, degrees, cos, sin, asin, sqrt
+from django.db.models import F, FloatField, Q, Value
+from django.db.models.functions import ASin, Cast, Cos, Least, Power, Radians, Sin, Sqrt
+
+# Mean radius of the earth in kilometers
+EARTH_RADIUS_KM = 6371
+
+# Precision used when storing a hangout's geohash (~5m cells)
+GEOHASH_PRECISION = 9
+
+_BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+
+
+def encode_geohash(latitude, longitude, precision=GEOHASH_PRECISION):
+    """
+    Encode a coordinate pair as a geohash string.
+    Nearby points share a common prefix, which lets us prefilter with an index.
+    """
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    latitude = max(-90.0, min(90.0, float(latitude)))
+    longitude = ((float(longitude) + 180.0) % 360.0) - 180.0
+
+    chars = []
+    bits = 0
+    bit_count = 0
+    even = True
+    while len(chars) < precision:
+        if even:
+            mid = (lon_range[0] + lon_range[1]) / 2
+            if longitude >= mid:
+                bits = (bits << 1) | 1
+                lon_range[0] = mid
+            else:
+                bits <<= 1
+                lon_range[1] = mid
+        else:
+            mid = (lat_range[0] + lat_range[1]) / 2
+            if latitude >= mid:
+                bits = (bits << 1) | 1
+                lat_range[0] = mid
+            else:
+                bits <<= 1
+                lat_range[1] = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(_BASE32[bits])
+            bits = 0
+            bit_count = 0
+    return ''.join(chars)
+
+
+def geohash_cell_size(precision):
+    """Return the (height, width) in degrees of a geohash cell"""
+    lat_bits = (5 * precision) // 2
+    lon_bits = 5 * precision - lat_bits
+    return 180.0 / (2 ** lat_bits), 360.0 / (2 ** lon_bits)
+
+
+def geohash_upper_bound(prefix):
+    """
+    Return the smallest geohash greater than every geohash starting with prefix.
+    Range comparisons on the prefix use a plain b-tree index on every backend.
+    """
+    while prefix:
+        position = _BASE32.index(prefix[-1])
+        if position + 1 < len(_BASE32):
+            return prefix[:-1] + _BASE32[position + 1]
+        prefix = prefix[:-1]
+    return None
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """Great-circle distance between two points in kilometers"""
+    lon1, lat1, lon2, lat2 = map(radians, [lon1, lat1, lon2, lat2])
+    dlon = lon2 - lon1
+    dlat = lat2 - lat1
+    a = sin(dlat / 2) ** 2 + cos(lat1) * cos(lat2) * sin(dlon / 2) ** 2
+    return 2 * asin(sqrt(a)) * EARTH_RADIUS_KM
+
+
+def bounding_box(latitude, longitude, radius_km):
+    """
+    Return (min_lat, max_lat, lon_ranges) enclosing a circle around a point.
+    lon_ranges holds two ranges when the box crosses the antimeridian.
+    """
+    dlat = degrees(radius_km / EARTH_RADIUS_KM)
+    min_lat = latitude - dlat
+    max_lat = latitude + dlat
+
+    # Circles touching a pole cover every longitude
+    if min_lat <= -90 or max_lat >= 90:
+        return max(min_lat, -90.0), min(max_lat, 90.0), [(-180.0, 180.0)]
+
+    dlon = degrees(radius_km / (EARTH_RADIUS_KM * cos(radians(latitude))))
+    if dlon >= 180:
+        return min_lat, max_lat, [(-180.0, 180.0)]
+
+    min_lon = longitude - dlon
+    max_lon = longitude + dlon
+    if min_lon < -180:
+        return min_lat, max_lat, [(min_lon + 360, 180.0), (-180.0, max_lon)]
+    if max_lon > 180:
+        return min_lat, max_lat, [(min_lon, 180.0), (-180.0, max_lon - 360)]
+    return min_lat, max_lat, [(min_lon, max_lon)]
+
+
+def covering_geohashes(min_lat, max_lat, lon_ranges):
+    """
+    Return a small set of geohash prefixes whose cells cover the bounding box.
+    Returns an empty list when the box is too large for a useful prefilter.
+    """
+    height = max_lat - min_lat
+    width = sum(high - low for low, high in lon_ranges)
+
+    precision = 0
+    for candidate in range(GEOHASH_PRECISION, 0, -1):
+        cell_height, cell_width = geohash_cell_size(candidate)
+        if cell_height >= height and cell_width >= width:
+            precision = candidate
+            break
+    if not precision:
+        return []
+
+    cell_height, cell_width = geohash_cell_size(precision)
+    prefixes = set()
+    for low, high in lon_ranges:
+        lat = min_lat
+        while True:
+            lon = low
+            while True:
+                prefixes.add(encode_geohash(lat, lon, precision))
+                if lon >= high:
+                    break
+                lon = min(lon + cell_width, high)
+            if lat >= max_lat:
+                break
+            lat = min(lat + cell_height, max_lat)
+    return sorted(prefixes)
+
+
+def bounding_box_filter(latitude, longitude, radius_km):
+    """
+    Build an index-friendly Q that keeps hangouts inside the radius' bounding box.
+    Callers still need an exact distance check on the matching rows.
+    """
+    min_lat, max_lat, lon_ranges = bounding_box(latitude, longitude, radius_km)
+
+    lon_filter = Q()
+    for low, high in lon_ranges:
+        lon_filter |= Q(longitude__gte=low, longitude__lte=high)
+    query = Q(latitude__gte=min_lat, latitude__lte=max_lat) & lon_filter
+
+    prefix_filter = Q()
+    for prefix in covering_geohashes(min_lat, max_lat, lon_ranges):
+        upper = geohash_upper_bound(prefix)
+        if upper:
+            prefix_filter |= Q(geohash__gte=prefix, geohash__lt=upper)
+        else:
+            prefix_filter |= Q(geohash__gte=prefix)
+    if prefix_filter:
+        query &= prefix_filter
+    return query
+
+
+def annotate_distance(queryset, latitude, longitude, radius_km=None):
+    """
+    Annotate each hangout with distance_km from the given point.
+    The haversine formula runs in the database as a single expression, and
+    rows outside radius_km (when given) are filtered out in the same query.
+    """
+    if radius_km is not None:
+        queryset = queryset.filter(bounding_box_filter(latitude, longitude, radius_km))
+
+    lat1 = Value(radians(latitude), output_field=FloatField())
+    lon1 = Value(radians(longitude), output_field=FloatField())
+    lat2 = Radians(Cast(F('latitude'), FloatField()))
+    lon2 = Radians(Cast(F('longitude'), FloatField()))
+    half_chord = (
+        Power(Sin((lat2 - lat1) / 2), 2)
+        + Cos(lat1) * Cos(lat2) * Power(Sin((lon2 - lon1) / 2), 2)
+    )
+    # Clamp to 1 so float rounding never pushes asin out of its domain
+    central_angle = 2 * ASin(Least(Sqrt(half_chord), Value(1.0)))
+    queryset = queryset.filter(
+        latitude__isnull=False, longitude__isnull=False
+    ).annotate(distance_km=central_angle * EARTH_RADIUS_KM)
+
+    if radius_km is not None:
+        queryset = queryset.filter(distance_km__lte=radius_km)
+    return queryset
@@ -0,0 +1,54 @@
+from django.db import transaction
+from users.friends import get_friend_ids
+from .models import Hangout
+
+
+def invite_friends(hangout_id, inviter, user_ids):
+    """
+    Add the inviter's friends to a hangout in bulk.
+
+    Friendship is checked against the cached friend set, membership and kicks
+    with one query each, and the hangout row is locked so invites never push
+    it past max_group_size. Ids that don't fit are reported as over capacity.
+    Returns a dict with the invited ids and the skipped ids by reason.
+    """
+    user_ids = list(dict.fromkeys(user_ids))  # dedupe, keep order
+    result = {
+        'invited': [],
+        'not_friends': [],
+        'already_participants': [],
+        'kicked': [],
+        'over_capacity': [],
+    }
+    if not user_ids:
+        return result
+
+    friends = get_friend_ids(inviter.id)
+    with transaction.atomic():
+        # Same lock as join_hangout so invites and joins can't both take the last spot
+        hangout = Hangout.objects.select_for_update().get(pk=hangout_id)
+        members = set(Hangout.participants.through.objects.filter(
+            hangout_id=hangout.pk, user_id__in=user_ids
+        ).values_list('user_id', flat=True))
+        kicked = set(Hangout.kicked_users.through.objects.filter(
+            hangout_id=hangout.pk, user_id__in=user_ids
+        ).values_list('user_id', flat=True))
+
+        free_spots = max(hangout.max_group_size - hangout.participant_count, 0)
+        for user_id in user_ids:
+            if user_id in members:
+                result['already_participants'].append(user_id)
+            elif user_id not in friends:
+                result['not_friends'].append(user_id)
+            elif user_id in kicked:
+                result['kicked'].append(user_id)
+            elif len(result['invited']) < free_spots:
+                result['invited'].append(user_id)
+            else:
+                result['over_capacity'].append(user_id)
+
+        if result['invited']:
+            # A single insert on the through table; m2m_changed keeps
+            # participant_count and the caches in step
+            hangout.participants.add(*result['invited'])
+    return result
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+from hangouts.archive import archive_hangouts
+
+
+class Command(BaseCommand):
+    help = 'Move long-ended hangouts and their history into the archive tables'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=None,
+            help='Archive hangouts ended more than this many days ago '
+                 '(defaults to HANGOUT_ARCHIVE_AFTER_DAYS)'
+        )
+        parser.add_argument('--batch-size', type=int, default=200)
+
+    def handle(self, *args, **options):
+        archived = archive_hangouts(options['days'], options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Archived {archived} hangouts'))
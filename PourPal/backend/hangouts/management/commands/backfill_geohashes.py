@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand
+from hangouts.geo import encode_geohash
+from hangouts.models import Hangout
+
+
+class Command(BaseCommand):
+    help = (
+        'Compute the geohash of hangouts that have coordinates but no geohash yet '
+        '(migration 0007 fills existing rows; use --all after changing the encoding)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Recompute every geohash instead of only the missing ones'
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        queryset = Hangout.objects.filter(latitude__isnull=False, longitude__isnull=False)
+        if not options['all']:
+            queryset = queryset.filter(geohash='')
+
+        updated = 0
+        last_id = 0
+        while True:
+            # Walk the table by primary key so each batch is an index range scan
+            batch = list(
+                queryset.filter(id__gt=last_id)
+                .order_by('id')
+                .only('id', 'latitude', 'longitude')[:batch_size]
+            )
+            if not batch:
+                break
+            for hangout in batch:
+                hangout.geohash = encode_geohash(hangout.latitude, hangout.longitude)
+            Hangout.objects.bulk_update(batch, ['geohash'])
+            updated += len(batch)
+            last_id = batch[-1].id
+
+        self.stdout.write(self.style.SUCCESS(f'Updated geohash for {updated} hangouts'))
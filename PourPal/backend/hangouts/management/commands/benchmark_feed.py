@@ -0,0 +1,112 @@
+import random
+import time
+from datetime import timedelta
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from hangouts.cache import normalize_feed_params
+from hangouts.geo import encode_geohash
+from hangouts.models import Hangout
+from hangouts.views import apply_feed_filters
+from users.models import User
+
+# Plan fragments that mean the whole hangouts table is read
+FULL_SCAN_MARKERS = ('SCAN hangouts_hangout\n', 'Seq Scan on hangouts_hangout')
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        'Seed a large hangouts table, run the feed queries against it and check '
+        'that their plans use an index. Seeded rows are rolled back unless --keep is given.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1_000_000)
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--keep', action='store_true', help='Keep the seeded rows')
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                failures = self.run(options)
+                if not options['keep']:
+                    raise Rollback
+        except Rollback:
+            pass
+
+        if failures:
+            raise CommandError(f'Full table scan in: {", ".join(failures)}')
+        self.stdout.write(self.style.SUCCESS('Every feed query uses an index'))
+
+    def run(self, options):
+        self.seed(options['rows'], options['batch_size'])
+
+        today = timezone.localdate()
+        start = (today + timedelta(days=7)).isoformat()
+        end = (today + timedelta(days=9)).isoformat()
+        scenarios = {
+            'upcoming': {},
+            'category': {'category': 'drinks'},
+            'date range': {'start_date': start, 'end_date': end, 'tz': 'Europe/Bucharest'},
+            'category and date range': {'category': 'music', 'start_date': start, 'end_date': end},
+            'radius': {'lat': '44.43', 'lon': '26.10', 'radius': '5'},
+        }
+
+        failures = []
+        for name, params in scenarios.items():
+            # Same query the feed view builds for its first page
+            queryset = apply_feed_filters(
+                Hangout.objects.filter(date_time__gte=timezone.now()).order_by('date_time', 'id'),
+                normalize_feed_params(params)
+            )[:21]
+            plan = queryset.explain()
+
+            started = time.perf_counter()
+            count = len(list(queryset.values_list('id', flat=True)))
+            elapsed = (time.perf_counter() - started) * 1000
+
+            self.stdout.write(self.style.MIGRATE_HEADING(f'{name}: {count} rows in {elapsed:.1f}ms'))
+            self.stdout.write(plan)
+            if any(marker in plan + '\n' for marker in FULL_SCAN_MARKERS):
+                failures.append(name)
+        return failures
+
+    def seed(self, rows, batch_size):
+        creator, _ = User.objects.get_or_create(
+            email='feed-benchmark@pourpal.local',
+            defaults={'username': 'feed-benchmark', 'first_name': 'Benchmark'}
+        )
+        categories = [choice for choice, _ in Hangout.CATEGORY_CHOICES]
+        now = timezone.now()
+        rng = random.Random(42)
+
+        started = time.perf_counter()
+        created = 0
+        while created < rows:
+            batch = []
+            for _ in range(min(batch_size, rows - created)):
+                latitude = round(rng.uniform(43.6, 48.3), 6)
+                longitude = round(rng.uniform(20.2, 29.7), 6)
+                # A year of history and a year ahead, like a long-running deployment
+                date_time = now + timedelta(minutes=rng.randint(-525600, 525600))
+                batch.append(Hangout(
+                    title='Benchmark hangout',
+                    venue_location='Benchmark venue',
+                    latitude=latitude,
+                    longitude=longitude,
+                    geohash=encode_geohash(latitude, longitude),
+                    date_time=date_time,
+                    max_group_size=rng.randint(2, 10),
+                    category=rng.choice(categories),
+                    creator=creator,
+                    is_ended=date_time < now,
+                ))
+            Hangout.objects.bulk_create(batch)
+            created += len(batch)
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(f'Seeded {created} hangouts in {elapsed:.1f}s')
@@ -0,0 +1,55 @@
+import time
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from hangouts.models import Hangout
+from hangouts.signals import hangouts_ended
+
+
+class Command(BaseCommand):
+    help = 'End every held hangout whose auto_end_date has passed, in chunked bulk updates'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument(
+            '--interval',
+            type=int,
+            default=0,
+            help='Keep running and sweep again every N seconds (0 sweeps once)'
+        )
+
+    def sweep(self, batch_size):
+        ended = 0
+        while True:
+            now = timezone.now()
+            with transaction.atomic():
+                # Uses the (is_ended, auto_end_date) index. Locking the rows
+                # keeps a concurrent end from slipping in before the UPDATE,
+                # so every id below is one this chunk really ends.
+                ids = list(
+                    Hangout.objects.due_for_auto_end(now)
+                    .select_for_update(skip_locked=True)
+                    .order_by('auto_end_date')
+                    .values_list('id', flat=True)[:batch_size]
+                )
+                if not ids:
+                    break
+                # One UPDATE per chunk. updated_at is set by hand because
+                # update() skips auto_now, and detail ETags depend on it.
+                Hangout.objects.filter(id__in=ids).update(
+                    is_ended=True,
+                    ended_at=now,
+                    updated_at=now
+                )
+                # One notification for the whole chunk
+                hangouts_ended.send(sender=Hangout, hangout_ids=ids, ended_at=now)
+            ended += len(ids)
+        return ended
+
+    def handle(self, *args, **options):
+        while True:
+            ended = self.sweep(options['batch_size'])
+            self.stdout.write(self.style.SUCCESS(f'Ended {ended} expired hangouts'))
+            if not options['interval']:
+                break
+            time.sleep(options['interval'])
@@ -0,0 +1,50 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from hangouts.models import Hangout
+
+
+class Command(BaseCommand):
+    help = 'Repair the denormalized participant_count of hangouts by recounting in bulk'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only report how many hangouts have a wrong count'
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        memberships = Hangout.participants.through.objects.filter(
+            hangout=OuterRef('pk')
+        ).order_by().values('hangout').annotate(total=Count('*')).values('total')
+
+        drifted = 0
+        repaired = 0
+        last_id = 0
+        while True:
+            # Walk the table in primary key ranges so each UPDATE stays short
+            ids = list(
+                Hangout.objects.filter(id__gt=last_id)
+                .order_by('id')
+                .values_list('id', flat=True)[:batch_size]
+            )
+            if not ids:
+                break
+            drifted_ids = list(
+                Hangout.objects.filter(id__gte=ids[0], id__lte=ids[-1])
+                .annotate(actual=Coalesce(Subquery(memberships), 0))
+                .exclude(participant_count=F('actual'))
+                .values_list('id', flat=True)
+            )
+            drifted += len(drifted_ids)
+            if drifted_ids and not options['dry_run']:
+                repaired += Hangout.objects.filter(id__in=drifted_ids).recount_participants()
+            last_id = ids[-1]
+
+        if options['dry_run']:
+            self.stdout.write(f'{drifted} hangouts have a wrong participant_count')
+        else:
+            self.stdout.write(self.style.SUCCESS(f'Repaired {repaired} hangouts'))
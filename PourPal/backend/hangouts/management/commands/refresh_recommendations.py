@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+from hangouts.models import HangoutRecommendation
+from hangouts.recommendations import refresh_user_recommendations
+
+
+class Command(BaseCommand):
+    help = (
+        'Recompute the stored hangout recommendations of every user that has them. '
+        'Run periodically: the time-to-start and fill ratio parts of a score drift.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=200)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        user_ids = list(
+            HangoutRecommendation.objects.order_by('user_id').values_list('user_id', flat=True).distinct()
+        )
+        for start in range(0, len(user_ids), batch_size):
+            refresh_user_recommendations(user_ids[start:start + batch_size])
+
+        self.stdout.write(self.style.SUCCESS(f'Refreshed recommendations for {len(user_ids)} users'))
@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand
+from hangouts.models import HangoutMemoryPhoto
+from hangouts.renditions import render_photo
+
+
+class Command(BaseCommand):
+    help = 'Render thumbnails and resized copies of memory photos that have none yet'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=100)
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Re-render every photo instead of only the missing ones'
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        queryset = HangoutMemoryPhoto.objects.exclude(image='')
+        if not options['all']:
+            queryset = queryset.filter(renditions={})
+
+        rendered = 0
+        failed = 0
+        last_id = 0
+        while True:
+            ids = list(
+                queryset.filter(id__gt=last_id).order_by('id').values_list('id', flat=True)[:batch_size]
+            )
+            if not ids:
+                break
+            for photo_id in ids:
+                try:
+                    render_photo(photo_id)
+                    rendered += 1
+                except Exception as exc:
+                    failed += 1
+                    self.stderr.write(f'Photo {photo_id}: {exc}')
+            last_id = ids[-1]
+
+        self.stdout.write(self.style.SUCCESS(f'Rendered {rendered} photos ({failed} failed)'))
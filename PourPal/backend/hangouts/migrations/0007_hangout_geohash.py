@@ -0,0 +1,35 @@
+# Generated by Django 4.2.7 on 2026-10-17 19:02
+
+from django.db import migrations, models
+from hangouts.geo import encode_geohash
+
+
+def fill_geohashes(apps, schema_editor):
+    # Radius searches prefilter on geohash, so existing rows need one at once
+    Hangout = apps.get_model('hangouts', 'Hangout')
+    hangouts = Hangout.objects.filter(latitude__isnull=False, longitude__isnull=False)
+    last_id = 0
+    while True:
+        batch = list(hangouts.filter(id__gt=last_id).order_by('id').only('id', 'latitude', 'longitude')[:1000])
+        if not batch:
+            break
+        for hangout in batch:
+            hangout.geohash = encode_geohash(hangout.latitude, hangout.longitude)
+        Hangout.objects.bulk_update(batch, ['geohash'])
+        last_id = batch[-1].id
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hangouts', '0006_hangout_kicked_users'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='hangout',
+            name='geohash',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=12),
+        ),
+        migrations.RunPython(fill_geohashes, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-17 19:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hangouts', '0007_hangout_geohash'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='hangout',
+            index=models.Index(fields=['date_time', 'id'], name='hangouts_ha_date_ti_2eac93_idx'),
+        ),
+    ]
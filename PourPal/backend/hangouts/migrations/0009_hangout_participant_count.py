@@ -0,0 +1,28 @@
+# Generated by Django 4.2.7 on 2026-10-17 19:12
+
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+
+
+def count_participants(apps, schema_editor):
+    Hangout = apps.get_model('hangouts', 'Hangout')
+    memberships = Hangout.participants.through.objects.filter(
+        hangout=models.OuterRef('pk')
+    ).order_by().values('hangout').annotate(total=models.Count('*')).values('total')
+    Hangout.objects.update(participant_count=Coalesce(models.Subquery(memberships), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hangouts', '0008_hangout_date_time_id_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='hangout',
+            name='participant_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(count_participants, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-17 19:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hangouts', '0009_hangout_participant_count'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='hangout',
+            index=models.Index(fields=['is_ended', 'auto_end_date'], name='hangouts_ha_is_ende_77b047_idx'),
+        ),
+    ]
@@ -0,0 +1,59 @@
+# Generated by Django 4.2.7 on 2026-10-17 19:11
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('hangouts', '0010_hangout_auto_end_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedHangout',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('title', models.CharField(max_length=200)),
+                ('venue_location', models.CharField(max_length=300)),
+                ('latitude', models.DecimalField(blank=True, decimal_places=6, max_digits=9, null=True)),
+                ('longitude', models.DecimalField(blank=True, decimal_places=6, max_digits=9, null=True)),
+                ('date_time', models.DateTimeField()),
+                ('max_group_size', models.IntegerField(default=5)),
+                ('description', models.TextField()),
+                ('category', models.CharField(choices=[('drinks', 'Drinks & Bar'), ('food', 'Food & Dining'), ('sports', 'Sports & Fitness'), ('arts', 'Arts & Culture'), ('music', 'Music & Concerts'), ('outdoor', 'Outdoor Activities'), ('gaming', 'Gaming'), ('other', 'Other')], default='other', max_length=20)),
+                ('participant_count', models.PositiveIntegerField(default=0)),
+                ('ended_at', models.DateTimeField(blank=True, null=True)),
+                ('auto_end_date', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('creator', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_created_hangouts', to=settings.AUTH_USER_MODEL)),
+                ('participants', models.ManyToManyField(blank=True, related_name='archived_hangouts', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-date_time'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ArchivedMemoryPhoto',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('image', models.ImageField(upload_to='hangout_memories/')),
+                ('caption', models.CharField(blank=True, max_length=200)),
+                ('uploaded_at', models.DateTimeField()),
+                ('hangout', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='memory_photos', to='hangouts.archivedhangout')),
+                ('uploaded_by', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_memory_photos', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-uploaded_at'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='archivedhangout',
+            index=models.Index(fields=['date_time', 'id'], name='hangouts_ar_date_ti_757884_idx'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.7 on 2026-10-17 19:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hangouts', '0011_archivedhangout_archivedmemoryphoto'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='hangout',
+            index=models.Index(fields=['category', 'date_time'], name='hangouts_ha_categor_b708ac_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='hangout',
+            index=models.Index(fields=['is_ended', 'date_time'], name='hangouts_ha_is_ende_8ea4fe_idx'),
+        ),
+    ]
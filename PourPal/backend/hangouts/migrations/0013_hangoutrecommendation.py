@@ -0,0 +1,30 @@
+# Generated by Django 4.2.7 on 2026-10-17 19:17
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('hangouts', '0012_hangout_feed_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HangoutRecommendation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField()),
+                ('computed_at', models.DateTimeField(auto_now=True)),
+                ('hangout', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='recommendations', to='hangouts.hangout')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='hangout_recommendations', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['user', '-score'], name='hangouts_ha_user_id_8fe597_idx')],
+                'unique_together': {('user', 'hangout')},
+            },
+        ),
+    ]
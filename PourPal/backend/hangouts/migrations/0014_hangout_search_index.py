@@ -0,0 +1,81 @@
+from django.db import migrations
+
+# SQLite: an external-content FTS5 table kept in sync by triggers.
+# prefix='2 3' adds prefix indexes so short as-you-type terms stay fast.
+SQLITE_FORWARD = [
+    """
+    CREATE VIRTUAL TABLE hangouts_hangout_fts USING fts5(
+        title, venue_location, description,
+        content='hangouts_hangout', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER hangouts_hangout_fts_insert AFTER INSERT ON hangouts_hangout BEGIN
+        INSERT INTO hangouts_hangout_fts(rowid, title, venue_location, description)
+        VALUES (new.id, new.title, new.venue_location, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER hangouts_hangout_fts_delete AFTER DELETE ON hangouts_hangout BEGIN
+        INSERT INTO hangouts_hangout_fts(hangouts_hangout_fts, rowid, title, venue_location, description)
+        VALUES ('delete', old.id, old.title, old.venue_location, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER hangouts_hangout_fts_update
+    AFTER UPDATE OF title, venue_location, description ON hangouts_hangout BEGIN
+        INSERT INTO hangouts_hangout_fts(hangouts_hangout_fts, rowid, title, venue_location, description)
+        VALUES ('delete', old.id, old.title, old.venue_location, old.description);
+        INSERT INTO hangouts_hangout_fts(rowid, title, venue_location, description)
+        VALUES (new.id, new.title, new.venue_location, new.description);
+    END
+    """,
+    "INSERT INTO hangouts_hangout_fts(hangouts_hangout_fts) VALUES ('rebuild')",
+]
+
+SQLITE_REVERSE = [
+    'DROP TRIGGER IF EXISTS hangouts_hangout_fts_update',
+    'DROP TRIGGER IF EXISTS hangouts_hangout_fts_delete',
+    'DROP TRIGGER IF EXISTS hangouts_hangout_fts_insert',
+    'DROP TABLE IF EXISTS hangouts_hangout_fts',
+]
+
+# Postgres: a generated tsvector column, so every write keeps it in sync.
+# The 'simple' configuration doesn't stem, which suits mixed-language titles.
+POSTGRES_FORWARD = [
+    """
+    ALTER TABLE hangouts_hangout ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(venue_location, '')), 'B') ||
+        setweight(to_tsvector('simple', coalesce(description, '')), 'C')
+    ) STORED
+    """,
+    'CREATE INDEX hangouts_hangout_search_vector_idx ON hangouts_hangout USING GIN (search_vector)',
+]
+
+POSTGRES_REVERSE = [
+    'DROP INDEX IF EXISTS hangouts_hangout_search_vector_idx',
+    'ALTER TABLE hangouts_hangout DROP COLUMN IF EXISTS search_vector',
+]
+
+
+def _run(statements_by_vendor):
+    def run(apps, schema_editor):
+        for statement in statements_by_vendor.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(statement)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hangouts', '0013_hangoutrecommendation'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            _run({'sqlite': SQLITE_FORWARD, 'postgresql': POSTGRES_FORWARD}),
+            _run({'sqlite': SQLITE_REVERSE, 'postgresql': POSTGRES_REVERSE}),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.7 on 2026-10-17 19:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hangouts', '0014_hangout_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='archivedmemoryphoto',
+            name='renditions',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+        migrations.AddField(
+            model_name='hangoutmemoryphoto',
+            name='renditions',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
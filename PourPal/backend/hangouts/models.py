@@ -1,7 +1,71 @@
 from django.db import models
 from django.conf import settings
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 from datetime import timedelta
+from .geo import encode_geohash
+
+
+def _prefetch_users(queryset, expand):
+    """Load creator and participants with profiles, plus photos where expanded"""
+    from users.models import User
+    
+    users = User.objects.select_related('profile')
+    if 'participants' in expand:
+        users = users.prefetch_related('profile__photos')
+    queryset = queryset.select_related('creator__profile').prefetch_related(
+        models.Prefetch('participants', queryset=users),
+    )
+    if 'creator' in expand:
+        queryset = queryset.prefetch_related('creator__profile__photos')
+    return queryset
+
+
+class HangoutQuerySet(models.QuerySet):
+    
+    def with_participant_stats(self, user=None, expand=()):
+        """
+        Annotate is_user_participant with a subquery and prefetch participants
+        (with profile) in a fixed number of queries, instead of several
+        queries per hangout at serialization time. Profile photos are only
+        shown for the users named in expand (see SparseFieldsetMixin), so
+        they are only prefetched for those.
+        participant_count is a column kept up to date by signals.
+        """
+        if user is not None and user.is_authenticated:
+            is_user_participant = models.Exists(
+                Hangout.participants.through.objects.filter(
+                    hangout=models.OuterRef('pk'), user_id=user.id
+                )
+            )
+        else:
+            is_user_participant = models.Value(False, output_field=models.BooleanField())
+        
+        queryset = self.annotate(
+            is_user_participant=is_user_participant,
+        )
+        return _prefetch_users(queryset, expand)
+    
+    def not_full(self):
+        """Only hangouts with at least one free spot"""
+        return self.filter(participant_count__lt=models.F('max_group_size'))
+    
+    def due_for_auto_end(self, now=None):
+        """
+        Hangouts past their auto_end_date that have not been ended yet.
+        auto_end_date counts from creation, so a hangout scheduled further
+        ahead must also have taken place.
+        """
+        now = now or timezone.now()
+        return self.filter(is_ended=False, auto_end_date__lte=now, date_time__lt=now)
+    
+    def recount_participants(self):
+        """Recompute participant_count from the membership table in one UPDATE"""
+        memberships = Hangout.participants.through.objects.filter(
+            hangout=models.OuterRef('pk')
+        ).order_by().values('hangout').annotate(total=models.Count('*')).values('total')
+        return self.update(participant_count=Coalesce(models.Subquery(memberships), 0))
+
 
 class Hangout(models.Model):
     """
@@ -22,6 +86,8 @@ class Hangout(models.Model):
     venue_location = models.CharField(max_length=300)
     latitude = models.DecimalField(max_digits=9, decimal_places=6, null=True, blank=True)
     longitude = models.DecimalField(max_digits=9, decimal_places=6, null=True, blank=True)
+    # Geohash of the venue coordinates, used to prefilter radius searches
+    geohash = models.CharField(max_length=12, blank=True, db_index=True, editable=False)
     date_time = models.DateTimeField()
     max_group_size = models.IntegerField(default=5)
     description = models.TextField()
@@ -47,6 +113,8 @@ class Hangout(models.Model):
         related_name='kicked_from_hangouts',
         blank=True
     )
+    # Denormalized size of participants, maintained by m2m_changed signals
+    participant_count = models.PositiveIntegerField(default=0, editable=False)
     
     # Hangout status
     is_ended = models.BooleanField(default=False)
@@ -56,6 +124,8 @@ class Hangout(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = HangoutQuerySet.as_manager()
+    
     def __str__(self):
         return self.title
     
@@ -63,6 +133,22 @@ class Hangout(models.Model):
         # Set auto_end_date to 3 days after creation if not set
         if not self.auto_end_date and not self.pk:
             self.auto_end_date = timezone.now() + timedelta(days=3)
+        # Keep the geohash in sync with the venue coordinates
+        if self.latitude is not None and self.longitude is not None:
+            self.geohash = encode_geohash(self.latitude, self.longitude)
+        else:
+            self.geohash = ''
+        # participant_count is owned by the m2m signals; never write back a
+        # value that may have been loaded before someone joined or left
+        if (
+            not self._state.adding
+            and kwargs.get('update_fields') is None
+            and not kwargs.get('force_insert')
+        ):
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name != 'participant_count'
+            ]
         super().save(*args, **kwargs)
     
     def end_hangout(self):
@@ -74,12 +160,22 @@ class Hangout(models.Model):
     @property
     def should_auto_end(self):
         """Check if hangout should be automatically ended"""
-        if self.auto_end_date and timezone.now() >= self.auto_end_date:
+        now = timezone.now()
+        if self.auto_end_date and now >= self.auto_end_date and now > self.date_time:
             return True
         return False
 
     class Meta:
         ordering = ['date_time']
+        indexes = [
+            # Serves the feed's keyset pagination on (date_time, id)
+            models.Index(fields=['date_time', 'id']),
+            # Lets the auto-end sweeper find due hangouts without a table scan
+            models.Index(fields=['is_ended', 'auto_end_date']),
+            # Category and date range filters on the feed
+            models.Index(fields=['category', 'date_time']),
+            models.Index(fields=['is_ended', 'date_time']),
+        ]
 
 
 class HangoutMemory(models.Model):
@@ -110,6 +206,9 @@ class HangoutMemoryPhoto(models.Model):
         related_name='uploaded_memory_photos'
     )
     image = models.ImageField(upload_to='hangout_memories/')
+    # Resized copies by size and format, e.g. {'thumb': {'webp': path, 'jpeg': path}}.
+    # Filled in after upload by hangouts.renditions.
+    renditions = models.JSONField(default=dict, blank=True, editable=False)
     caption = models.CharField(max_length=200, blank=True)
     uploaded_at = models.DateTimeField(auto_now_add=True)
     
@@ -117,4 +216,107 @@ class HangoutMemoryPhoto(models.Model):
         ordering = ['-uploaded_at']
     
     def __str__(self):
-        return f"Memory photo for {self.memory.hangout.title}"
\ No newline at end of file
+        return f"Memory photo for {self.memory.hangout.title}"
+
+class ArchivedHangoutQuerySet(models.QuerySet):
+    
+    def with_participants(self, expand=()):
+        """Prefetch creator and participants the way with_participant_stats() does"""
+        return _prefetch_users(self, expand)
+
+
+class ArchivedHangout(models.Model):
+    """
+    Ended hangouts moved out of the hot Hangout table by archive_hangouts.
+    Keeps the original id so links and history keep working.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    title = models.CharField(max_length=200)
+    venue_location = models.CharField(max_length=300)
+    latitude = models.DecimalField(max_digits=9, decimal_places=6, null=True, blank=True)
+    longitude = models.DecimalField(max_digits=9, decimal_places=6, null=True, blank=True)
+    date_time = models.DateTimeField()
+    max_group_size = models.IntegerField(default=5)
+    description = models.TextField()
+    category = models.CharField(max_length=20, choices=Hangout.CATEGORY_CHOICES, default='other')
+    creator = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='archived_created_hangouts'
+    )
+    participants = models.ManyToManyField(
+        settings.AUTH_USER_MODEL,
+        related_name='archived_hangouts',
+        blank=True
+    )
+    participant_count = models.PositiveIntegerField(default=0)
+    ended_at = models.DateTimeField(null=True, blank=True)
+    auto_end_date = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+    
+    objects = ArchivedHangoutQuerySet.as_manager()
+    
+    # Fields copied one to one from Hangout when archiving
+    COPIED_FIELDS = [
+        'id', 'title', 'venue_location', 'latitude', 'longitude', 'date_time',
+        'max_group_size', 'description', 'category', 'creator_id',
+        'participant_count', 'ended_at', 'auto_end_date', 'created_at', 'updated_at',
+    ]
+    
+    is_ended = True
+    
+    class Meta:
+        ordering = ['-date_time']
+        indexes = [
+            models.Index(fields=['date_time', 'id']),
+        ]
+    
+    def __str__(self):
+        return self.title
+
+
+class ArchivedMemoryPhoto(models.Model):
+    """Memory photos of an archived hangout (the image file is not moved)"""
+    hangout = models.ForeignKey(ArchivedHangout, on_delete=models.CASCADE, related_name='memory_photos')
+    uploaded_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='archived_memory_photos'
+    )
+    image = models.ImageField(upload_to='hangout_memories/')
+    renditions = models.JSONField(default=dict, blank=True, editable=False)
+    caption = models.CharField(max_length=200, blank=True)
+    uploaded_at = models.DateTimeField()
+    
+    class Meta:
+        ordering = ['-uploaded_at']
+    
+    def __str__(self):
+        return f"Memory photo for {self.hangout.title}"
+
+
+class HangoutRecommendation(models.Model):
+    """
+    Precomputed recommendation score of an upcoming hangout for a user.
+    Kept up to date by hangouts.recommendations so serving is a single
+    indexed read ordered by score.
+    """
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='hangout_recommendations'
+    )
+    hangout = models.ForeignKey(Hangout, on_delete=models.CASCADE, related_name='recommendations')
+    score = models.FloatField()
+    computed_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        unique_together = ('user', 'hangout')
+        indexes = [
+            models.Index(fields=['user', '-score']),
+        ]
+    
+    def __str__(self):
+        return f"{self.hangout.title} for {self.user.email} ({self.score:.2f})"
@@ -0,0 +1,120 @@
+import base64
+import json
+from datetime import datetime
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination on a (datetime, id) key.
+
+    Each page continues strictly after the last row of the previous one with a
+    row-value comparison, so deep pages cost the same as the first one and rows
+    inserted meanwhile never shift or duplicate results the way OFFSET does.
+    The cursor is an opaque token that encodes the key of the last row.
+    """
+    page_size = 20
+    max_page_size = 100
+    page_size_query_param = 'page_size'
+    cursor_query_param = 'cursor'
+    ordering_field = 'date_time'
+    descending = False
+    invalid_cursor_message = 'Invalid cursor'
+
+    def __init__(self, cursor_query_param=None, descending=None):
+        if cursor_query_param is not None:
+            self.cursor_query_param = cursor_query_param
+        if descending is not None:
+            self.descending = descending
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return max(1, min(page_size, self.max_page_size))
+
+    def encode_cursor(self, value, pk):
+        payload = json.dumps([value.isoformat(), pk]).encode()
+        return base64.urlsafe_b64encode(payload).decode().rstrip('=')
+
+    def decode_cursor(self, token):
+        try:
+            padded = token + '=' * (-len(token) % 4)
+            value, pk = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            return datetime.fromisoformat(value), int(pk)
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def get_ordering(self):
+        prefix = '-' if self.descending else ''
+        return (prefix + self.ordering_field, prefix + 'id')
+
+    def after(self, value, pk):
+        """Q matching the rows that sort after (value, pk)"""
+        lookup = 'lt' if self.descending else 'gt'
+        return (
+            Q(**{f'{self.ordering_field}__{lookup}': value}) |
+            Q(**{self.ordering_field: value, f'id__{lookup}': pk})
+        )
+
+    def get_cursor(self, request):
+        """The (value, pk) key of the request's cursor, or None without one"""
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None
+        return self.decode_cursor(token)
+
+    def cursor_filter(self, request):
+        """Q matching the rows after the request's cursor (empty without one)"""
+        cursor = self.get_cursor(request)
+        if cursor is None:
+            return Q()
+        return self.after(*cursor)
+
+    def set_page(self, request, rows):
+        """
+        Take the page from rows already ordered and limited to page size + 1,
+        for callers that fetch them in a query of their own.
+        """
+        self.request = request
+        self.page_size_value = self.get_page_size(request)
+        self.has_next = len(rows) > self.page_size_value
+        self.page = rows[:self.page_size_value]
+        return self.page
+
+    def paginate_queryset(self, queryset, request, view=None):
+        queryset = queryset.filter(self.cursor_filter(request))
+        # Fetch one extra row to learn whether there is a next page
+        page_size = self.get_page_size(request)
+        rows = list(queryset.order_by(*self.get_ordering())[:page_size + 1])
+        return self.set_page(request, rows)
+
+    def get_next_cursor(self):
+        if not self.has_next:
+            return None
+        last = self.page[-1]
+        if isinstance(last, dict):
+            return self.encode_cursor(last[self.ordering_field], last['id'])
+        return self.encode_cursor(getattr(last, self.ordering_field), last.id)
+
+    def get_next_link(self):
+        cursor = self.get_next_cursor()
+        if cursor is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def get_paginated_data(self, data):
+        return {
+            'next': self.get_next_link(),
+            'next_cursor': self.get_next_cursor(),
+            'results': data,
+        }
+
+    def get_paginated_response(self, data):
+        return Response(self.get_paginated_data(data))
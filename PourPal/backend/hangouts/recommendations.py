@@ -0,0 +1,346 @@
+"""
+Scored hangout recommendations.
+
+Each candidate hangout gets a score in [0, 1] per user from:
+  - category affinity: the user's join history (live and archived) blended
+    with the categories their hobbies map to
+  - distance from the centre of the hangouts the user has joined
+  - how many of the user's friends are going
+  - how full the hangout already is
+  - how soon it starts
+
+Scores are materialized in HangoutRecommendation, so serving them is one
+indexed read. The signals in hangouts.signals refresh them incrementally on a
+background worker, off the request path; the refresh_recommendations command
+recomputes everything periodically.
+"""
+import logging
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from math import exp
+from django.core.cache import cache
+from django.db import connections, models, transaction
+from django.utils import timezone
+from users.friends import get_many_friend_ids
+from users.models import Profile
+from .geo import haversine_km
+from .models import Hangout, ArchivedHangout, HangoutRecommendation
+from .utils import HOBBY_CATEGORY_MAP
+
+logger = logging.getLogger(__name__)
+
+WEIGHTS = {
+    'affinity': 0.35,
+    'distance': 0.2,
+    'friends': 0.25,
+    'fill': 0.1,
+    'soon': 0.1,
+}
+
+# Weight of the hobby-based prior, counted in joined hangouts
+HOBBY_PRIOR = 2
+# Distance score halves roughly every 7km
+DISTANCE_SCALE_KM = 10
+# Friends going beyond this don't raise the score further
+FRIENDS_SATURATION = 3
+# Only hangouts starting within this window are candidates
+CANDIDATE_WINDOW = timedelta(days=30)
+MAX_CANDIDATES = 500
+RECOMMENDATIONS_PER_USER = 50
+
+MATERIALIZED_KEY = 'hangouts:recommendations:{id}:materialized'
+# Users left without recommendations are not reached by incremental
+# refreshes, so retry them after a while
+EMPTY_RETRY_SECONDS = 60 * 10
+
+_executor = None
+
+
+def _hobby_categories(hobbies):
+    categories = {HOBBY_CATEGORY_MAP[hobby] for hobby in hobbies or [] if hobby in HOBBY_CATEGORY_MAP}
+    # Same rule as get_user_category_preferences
+    if 'food' in categories:
+        categories.add('drinks')
+    return categories
+
+
+def build_user_contexts(user_ids):
+    """
+    Gather what scoring needs to know about many users at once, in a fixed
+    number of queries: category affinity, home location and friends.
+    """
+    joins = defaultdict(Counter)
+    for user_id, category, total in Hangout.participants.through.objects.filter(
+        user_id__in=user_ids
+    ).values_list('user_id', 'hangout__category').annotate(total=models.Count('*')):
+        joins[user_id][category] += total
+    for user_id, category, total in ArchivedHangout.participants.through.objects.filter(
+        user_id__in=user_ids
+    ).values_list('user_id', 'archivedhangout__category').annotate(total=models.Count('*')):
+        joins[user_id][category] += total
+
+    homes = {
+        user_id: (latitude, longitude)
+        for user_id, latitude, longitude in Hangout.participants.through.objects.filter(
+            user_id__in=user_ids,
+            hangout__latitude__isnull=False,
+            hangout__longitude__isnull=False,
+        ).values_list('user_id').annotate(
+            latitude=models.Avg('hangout__latitude'),
+            longitude=models.Avg('hangout__longitude'),
+        )
+    }
+
+    hobbies = dict(Profile.objects.filter(user_id__in=user_ids).values_list('user_id', 'hobbies'))
+
+    friends = get_many_friend_ids(user_ids)
+
+    contexts = {}
+    for user_id in user_ids:
+        history = joins[user_id]
+        total = sum(history.values())
+        preferred = _hobby_categories(hobbies.get(user_id))
+        affinity = {}
+        for category in set(history) | preferred:
+            prior = HOBBY_PRIOR if category in preferred else 0
+            affinity[category] = (history[category] + prior) / (total + HOBBY_PRIOR)
+        contexts[user_id] = {
+            'affinity': affinity,
+            'home': homes.get(user_id),
+            'friends': friends[user_id],
+        }
+    return contexts
+
+
+def candidate_hangouts(queryset=None, now=None):
+    """
+    Load upcoming hangouts with a free spot, with their participant and kicked
+    user ids, as plain dicts.
+    """
+    now = now or timezone.now()
+    if queryset is None:
+        queryset = Hangout.objects.all()
+    hangouts = list(queryset.filter(
+        date_time__gte=now,
+        date_time__lt=now + CANDIDATE_WINDOW,
+        is_ended=False,
+    ).not_full().order_by('date_time').values(
+        'id', 'category', 'latitude', 'longitude', 'date_time',
+        'participant_count', 'max_group_size', 'creator_id'
+    )[:MAX_CANDIDATES])
+
+    ids = [hangout['id'] for hangout in hangouts]
+    participants = defaultdict(set)
+    for hangout_id, user_id in Hangout.participants.through.objects.filter(
+        hangout_id__in=ids
+    ).values_list('hangout_id', 'user_id'):
+        participants[hangout_id].add(user_id)
+    kicked = defaultdict(set)
+    for hangout_id, user_id in Hangout.kicked_users.through.objects.filter(
+        hangout_id__in=ids
+    ).values_list('hangout_id', 'user_id'):
+        kicked[hangout_id].add(user_id)
+
+    for hangout in hangouts:
+        hangout['participants'] = participants[hangout['id']]
+        hangout['kicked'] = kicked[hangout['id']]
+    return hangouts
+
+
+def is_candidate_for(user_id, hangout):
+    return not (
+        user_id == hangout['creator_id']
+        or user_id in hangout['participants']
+        or user_id in hangout['kicked']
+    )
+
+
+def score_hangout(context, hangout, now):
+    """Score one candidate hangout for one user"""
+    affinity = context['affinity'].get(hangout['category'], 0)
+
+    distance = 0
+    if context['home'] and hangout['latitude'] is not None and hangout['longitude'] is not None:
+        km = haversine_km(
+            float(context['home'][0]), float(context['home'][1]),
+            float(hangout['latitude']), float(hangout['longitude'])
+        )
+        distance = exp(-km / DISTANCE_SCALE_KM)
+
+    friends_going = len(context['friends'] & hangout['participants'])
+    friends = min(friends_going, FRIENDS_SATURATION) / FRIENDS_SATURATION
+
+    fill = hangout['participant_count'] / hangout['max_group_size'] if hangout['max_group_size'] else 0
+
+    hours_left = (hangout['date_time'] - now).total_seconds() / 3600
+    soon = max(0, 1 - hours_left / (CANDIDATE_WINDOW.total_seconds() / 3600))
+
+    return (
+        WEIGHTS['affinity'] * affinity
+        + WEIGHTS['distance'] * distance
+        + WEIGHTS['friends'] * friends
+        + WEIGHTS['fill'] * fill
+        + WEIGHTS['soon'] * soon
+    )
+
+
+def refresh_user_recommendations(user_ids):
+    """Recompute and replace the stored recommendations of the given users"""
+    user_ids = list(user_ids)
+    if not user_ids:
+        return
+    now = timezone.now()
+    hangouts = candidate_hangouts(now=now)
+    contexts = build_user_contexts(user_ids)
+
+    rows = []
+    empty = []
+    for user_id in user_ids:
+        scored = sorted(
+            (
+                (score_hangout(contexts[user_id], hangout, now), hangout['id'])
+                for hangout in hangouts if is_candidate_for(user_id, hangout)
+            ),
+            reverse=True
+        )[:RECOMMENDATIONS_PER_USER]
+        rows.extend(
+            HangoutRecommendation(user_id=user_id, hangout_id=hangout_id, score=score)
+            for score, hangout_id in scored
+        )
+        if not scored:
+            empty.append(user_id)
+
+    with transaction.atomic():
+        HangoutRecommendation.objects.filter(user_id__in=user_ids).delete()
+        HangoutRecommendation.objects.bulk_create(rows)
+    cache.set_many({MATERIALIZED_KEY.format(id=user_id): True for user_id in user_ids}, None)
+    cache.set_many({MATERIALIZED_KEY.format(id=user_id): True for user_id in empty}, EMPTY_RETRY_SECONDS)
+
+
+def ensure_recommendations(user_id):
+    """Materialize a user's recommendations the first time they are needed"""
+    if cache.add(MATERIALIZED_KEY.format(id=user_id), True, None):
+        refresh_user_recommendations([user_id])
+
+
+def _merge_scores(user_id, current, hangout_id, score, upserts, evicted):
+    """
+    Offer one score to a user's stored top list (current: {hangout_id: score}).
+    It goes in if the hangout is already listed, the list has room, or it
+    beats the worst entry, which is then evicted to keep the cap.
+    """
+    if hangout_id not in current and len(current) >= RECOMMENDATIONS_PER_USER:
+        worst = min(current, key=current.get)
+        if score <= current[worst]:
+            return
+        del current[worst]
+        upserts.pop((user_id, worst), None)
+        evicted[user_id].add(worst)
+    current[hangout_id] = score
+    upserts[(user_id, hangout_id)] = score
+
+
+def refresh_hangout_recommendations(hangout_ids, user_ids=None, batch_size=500):
+    """
+    Rescore some hangouts for users whose recommendations are materialized
+    (or only for user_ids), without recomputing anything else. A hangout
+    only enters a user's list if it beats their current worst entry, and
+    that entry is dropped in the same transaction, so lists stay capped at
+    RECOMMENDATIONS_PER_USER. Runs on the background worker, see schedule_refresh.
+    """
+    now = timezone.now()
+    hangouts = candidate_hangouts(Hangout.objects.filter(id__in=hangout_ids), now=now)
+
+    # Hangouts that are no longer candidates (full, ended, started) drop out
+    stale = set(hangout_ids) - {hangout['id'] for hangout in hangouts}
+    if stale:
+        HangoutRecommendation.objects.filter(hangout_id__in=stale).delete()
+    if not hangouts:
+        return
+
+    if user_ids is None:
+        user_ids = HangoutRecommendation.objects.order_by().values_list(
+            'user_id', flat=True
+        ).distinct()
+    user_ids = list(user_ids)
+
+    for start in range(0, len(user_ids), batch_size):
+        batch = user_ids[start:start + batch_size]
+        contexts = build_user_contexts(batch)
+
+        with transaction.atomic():
+            stored = defaultdict(dict)
+            for user_id, hangout_id, score in HangoutRecommendation.objects.filter(
+                user_id__in=batch
+            ).values_list('user_id', 'hangout_id', 'score'):
+                stored[user_id][hangout_id] = score
+
+            upserts = {}
+            removed = defaultdict(set)
+            for hangout in hangouts:
+                for user_id in batch:
+                    current = stored[user_id]
+                    if is_candidate_for(user_id, hangout):
+                        score = score_hangout(contexts[user_id], hangout, now)
+                        _merge_scores(user_id, current, hangout['id'], score, upserts, removed)
+                    elif current.pop(hangout['id'], None) is not None:
+                        removed[user_id].add(hangout['id'])
+
+            removals = models.Q()
+            for user_id, hangout_ids_to_remove in removed.items():
+                removals |= models.Q(user_id=user_id, hangout_id__in=hangout_ids_to_remove)
+            if removals:
+                HangoutRecommendation.objects.filter(removals).delete()
+            HangoutRecommendation.objects.bulk_create(
+                [
+                    HangoutRecommendation(user_id=user_id, hangout_id=hangout_id, score=score)
+                    for (user_id, hangout_id), score in upserts.items()
+                ],
+                update_conflicts=True,
+                unique_fields=['user', 'hangout'],
+                update_fields=['score', 'computed_at'],
+            )
+
+
+def refresh_after_membership_change(hangout_ids, user_ids):
+    """
+    Joining or leaving changes the members' own affinity and candidates, and
+    the friends-going score of the hangouts for their friends.
+    """
+    refresh_user_recommendations(user_ids)
+    friend_ids = set().union(*get_many_friend_ids(user_ids).values()) - set(user_ids)
+    # With no friends this still drops hangouts that just became full
+    refresh_hangout_recommendations(hangout_ids, user_ids=friend_ids)
+
+
+def get_executor():
+    global _executor
+    if _executor is None:
+        # A single worker keeps refreshes in order, so their upserts never race
+        _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='recommendations')
+    return _executor
+
+
+def _refresh_in_worker(refresh, args):
+    try:
+        refresh(*args)
+    except Exception:
+        # The periodic refresh_recommendations command catches up
+        logger.exception('Failed to refresh recommendations')
+    finally:
+        connections.close_all()
+
+
+def schedule_refresh(refresh, *args):
+    """Run a refresh on the background worker once the current transaction commits"""
+    transaction.on_commit(lambda: get_executor().submit(_refresh_in_worker, refresh, args))
+
+
+def recommended_hangouts(user):
+    """A user's recommendations, best first, read from the materialized scores"""
+    return Hangout.objects.filter(
+        recommendations__user=user,
+        date_time__gte=timezone.now(),
+        is_ended=False,
+    ).not_full().order_by('-recommendations__score')
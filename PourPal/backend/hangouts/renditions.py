@@ -0,0 +1,120 @@
+"""
+Resized renditions of memory photos.
+
+Uploads only store the original; rendering runs on a small thread pool once
+the upload has committed, so the request returns right away. Pillow releases
+the GIL while decoding and encoding, so a few threads make good progress.
+"""
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from PIL import Image, ImageOps
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import connections, transaction
+from users.media import file_name, release_media, retain_media
+from .models import HangoutMemoryPhoto
+
+logger = logging.getLogger(__name__)
+
+# Longest edge in pixels of each rendition
+SIZES = {
+    'thumb': 320,
+    'medium': 1080,
+    'full': 2048,
+}
+
+# (extension, Pillow format, save options)
+FORMATS = [
+    ('webp', 'WEBP', {'quality': 80, 'method': 4}),
+    ('jpeg', 'JPEG', {'quality': 85, 'optimize': True, 'progressive': True}),
+]
+
+DEFAULT_WORKERS = 2
+
+_executor = None
+
+
+def get_executor():
+    global _executor
+    if _executor is None:
+        workers = getattr(settings, 'MEMORY_PHOTO_RENDITION_WORKERS', DEFAULT_WORKERS)
+        _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='renditions')
+    return _executor
+
+
+def rendition_name(original_name, size, extension):
+    stem = os.path.splitext(os.path.basename(original_name))[0]
+    return f'hangout_memories/renditions/{stem}_{size}.{extension}'
+
+
+def rendition_paths(renditions):
+    """Every stored file name in a renditions dict"""
+    extensions = {extension for extension, _, _ in FORMATS}
+    return [
+        path
+        for rendition in (renditions or {}).values()
+        for key, path in rendition.items()
+        if key in extensions
+    ]
+
+
+def memory_photo_names(photo):
+    """The original and every rendition a memory photo row references"""
+    return [file_name(photo, 'image'), *rendition_paths(photo.__dict__.get('renditions'))]
+
+
+def render_image(photo):
+    """Write every rendition of a photo to storage and return their paths"""
+    storage = photo.image.storage
+    with photo.image.open('rb') as original:
+        image = Image.open(original)
+        # Apply the camera orientation before the EXIF data is dropped
+        image = ImageOps.exif_transpose(image)
+        image = image.convert('RGB')
+
+    renditions = {}
+    for size, longest_edge in SIZES.items():
+        resized = image.copy()
+        # thumbnail() keeps the aspect ratio and never upscales
+        resized.thumbnail((longest_edge, longest_edge), Image.LANCZOS)
+        paths = {}
+        for extension, image_format, options in FORMATS:
+            buffer = BytesIO()
+            resized.save(buffer, image_format, **options)
+            name = rendition_name(photo.image.name, size, extension)
+            # Identical output is stored once, so re-rendering adds no copies
+            paths[extension] = storage.save(name, ContentFile(buffer.getvalue()))
+        renditions[size] = {**paths, 'width': resized.width, 'height': resized.height}
+    return renditions
+
+
+def render_photo(photo_id):
+    """Render one photo and store the rendition paths on it"""
+    photo = HangoutMemoryPhoto.objects.filter(pk=photo_id).first()
+    if photo is None or not photo.image:
+        return None
+    renditions = render_image(photo)
+    with transaction.atomic():
+        HangoutMemoryPhoto.objects.filter(pk=photo_id).update(renditions=renditions)
+        # update() skips the row signals, so count the references here
+        retain_media(rendition_paths(renditions))
+        release_media(rendition_paths(photo.renditions))
+    return renditions
+
+
+def _render_in_worker(photo_id):
+    try:
+        render_photo(photo_id)
+    except Exception:
+        # The original is still served until a backfill succeeds
+        logger.exception('Failed to render memory photo %s', photo_id)
+    finally:
+        # Worker threads open their own database connections
+        connections.close_all()
+
+
+def schedule_renditions(photo_id):
+    """Render a photo on the worker pool once the current transaction commits"""
+    transaction.on_commit(lambda: get_executor().submit(_render_in_worker, photo_id))
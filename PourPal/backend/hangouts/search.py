@@ -0,0 +1,125 @@
+import re
+from django.db import connection, connections, models
+from django.db.models.expressions import RawSQL
+
+# Longer queries add little and make the match expression expensive
+MAX_TERMS = 8
+
+_TERM_RE = re.compile(r'\w+', re.UNICODE)
+
+# The triggers keeping hangouts_hangout_fts in sync (created by migration 0014).
+# SQLite drops them whenever Django rebuilds hangouts_hangout to alter it.
+SQLITE_SYNC_TRIGGERS = {
+    'hangouts_hangout_fts_insert': """
+        CREATE TRIGGER hangouts_hangout_fts_insert AFTER INSERT ON hangouts_hangout BEGIN
+            INSERT INTO hangouts_hangout_fts(rowid, title, venue_location, description)
+            VALUES (new.id, new.title, new.venue_location, new.description);
+        END
+    """,
+    'hangouts_hangout_fts_delete': """
+        CREATE TRIGGER hangouts_hangout_fts_delete AFTER DELETE ON hangouts_hangout BEGIN
+            INSERT INTO hangouts_hangout_fts(hangouts_hangout_fts, rowid, title, venue_location, description)
+            VALUES ('delete', old.id, old.title, old.venue_location, old.description);
+        END
+    """,
+    'hangouts_hangout_fts_update': """
+        CREATE TRIGGER hangouts_hangout_fts_update
+        AFTER UPDATE OF title, venue_location, description ON hangouts_hangout BEGIN
+            INSERT INTO hangouts_hangout_fts(hangouts_hangout_fts, rowid, title, venue_location, description)
+            VALUES ('delete', old.id, old.title, old.venue_location, old.description);
+            INSERT INTO hangouts_hangout_fts(rowid, title, venue_location, description)
+            VALUES (new.id, new.title, new.venue_location, new.description);
+        END
+    """,
+}
+
+
+def parse_terms(query):
+    """Split a free-text query into lowercase word terms"""
+    return [term.lower() for term in _TERM_RE.findall(query or '')][:MAX_TERMS]
+
+
+def ensure_sqlite_search_triggers(using='default'):
+    """
+    Recreate any missing FTS sync trigger and rebuild the index, since writes
+    made while a trigger was gone never reached it. Returns the recreated names.
+    """
+    db = connections[using]
+    if db.vendor != 'sqlite':
+        return []
+    with db.cursor() as cursor:
+        cursor.execute(
+            "SELECT type, name FROM sqlite_master WHERE name LIKE 'hangouts_hangout_fts%%'"
+        )
+        found = {(kind, name) for kind, name in cursor.fetchall()}
+        if ('table', 'hangouts_hangout_fts') not in found:
+            # Migration 0014 hasn't run yet
+            return []
+        missing = [
+            name for name in SQLITE_SYNC_TRIGGERS if ('trigger', name) not in found
+        ]
+        for name in missing:
+            cursor.execute(SQLITE_SYNC_TRIGGERS[name])
+        if missing:
+            cursor.execute("INSERT INTO hangouts_hangout_fts(hangouts_hangout_fts) VALUES ('rebuild')")
+    return missing
+
+
+def _sqlite_search(queryset, terms):
+    # Every term is a prefix so results show up while the user is typing
+    match = ' AND '.join(f'"{term}"*' for term in terms)
+    matches = "SELECT rowid FROM hangouts_hangout_fts WHERE hangouts_hangout_fts MATCH %s"
+    # bm25 is lower for better matches; title hits count most
+    rank = (
+        "SELECT -bm25(hangouts_hangout_fts, 10.0, 4.0, 1.0) FROM hangouts_hangout_fts "
+        "WHERE hangouts_hangout_fts MATCH %s AND rowid = hangouts_hangout.id"
+    )
+    return queryset.filter(
+        id__in=RawSQL(matches, [match])
+    ).annotate(
+        search_rank=RawSQL(rank, [match], output_field=models.FloatField())
+    )
+
+
+def _postgres_search(queryset, terms):
+    tsquery = ' & '.join(f'{term}:*' for term in terms)
+    return queryset.filter(
+        RawSQL(
+            "hangouts_hangout.search_vector @@ to_tsquery('simple', %s)",
+            [tsquery],
+            output_field=models.BooleanField()
+        )
+    ).annotate(
+        search_rank=RawSQL(
+            "ts_rank(hangouts_hangout.search_vector, to_tsquery('simple', %s))",
+            [tsquery],
+            output_field=models.FloatField()
+        )
+    )
+
+
+def _fallback_search(queryset, terms):
+    for term in terms:
+        queryset = queryset.filter(
+            models.Q(title__icontains=term) |
+            models.Q(venue_location__icontains=term) |
+            models.Q(description__icontains=term)
+        )
+    return queryset.annotate(search_rank=models.Value(0.0, output_field=models.FloatField()))
+
+
+def search_hangouts(queryset, query):
+    """
+    Keep the hangouts matching every term of query, annotated with
+    search_rank (higher is better).
+    Uses the FTS5 table on SQLite and the GIN-indexed tsvector on Postgres,
+    both created by migration 0014.
+    """
+    terms = parse_terms(query)
+    if not terms:
+        return queryset.none()
+    if connection.vendor == 'sqlite':
+        return _sqlite_search(queryset, terms)
+    if connection.vendor == 'postgresql':
+        return _postgres_search(queryset, terms)
+    return _fallback_search(queryset, terms)
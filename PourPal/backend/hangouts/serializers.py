@@ -1,39 +1,111 @@
 from rest_framework import serializers
-from .models import Hangout, HangoutMemory, HangoutMemoryPhoto
-from users.serializers import UserSerializer
+from .models import Hangout, HangoutMemory, HangoutMemoryPhoto, ArchivedHangout, ArchivedMemoryPhoto
+from users.serializers import UserSerializer, UserSummarySerializer
 
 
-class HangoutSerializer(serializers.ModelSerializer):
+def _split_param(value):
+    return {item.strip() for item in (value or '').split(',') if item.strip()}
+
+
+def get_expand(request):
+    """Nested users the request asked to ?expand, for with_participant_stats()"""
+    params = getattr(request, 'query_params', None) or {}
+    return _split_param(params.get('expand'))
+
+
+class SparseFieldsetMixin:
+    """
+    Lets clients shape the response through query parameters:
+    ?fields=id,title,... keeps only the listed fields and
+    ?expand=participants,... swaps compact nested users for the full ones.
+    Dropped fields are never computed, so this saves queries as well as bytes.
+    """
+    # field name -> (serializer class, keyword arguments) used when expanded
+    expandable_fields = {}
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get('request')
+        params = getattr(request, 'query_params', None) or {}
+        
+        expand = get_expand(request)
+        for name, (serializer_class, options) in self.expandable_fields.items():
+            if name in expand:
+                self.fields[name] = serializer_class(read_only=True, **options)
+        
+        fields = _split_param(params.get('fields'))
+        if fields:
+            for name in set(self.fields) - fields:
+                self.fields.pop(name)
+
+
+class HangoutSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Serializer for Hangout list and detail views"""
-    creator = UserSerializer(read_only=True)
-    participants = UserSerializer(many=True, read_only=True)
-    participant_count = serializers.SerializerMethodField()
+    creator = UserSummarySerializer(read_only=True)
+    participants = UserSummarySerializer(many=True, read_only=True)
     is_full = serializers.SerializerMethodField()
     is_user_participant = serializers.SerializerMethodField()
+    distance_km = serializers.SerializerMethodField()
     
     class Meta:
         model = Hangout
         fields = [
-            'id', 'title', 'venue_location', 'latitude', 'longitude', 'date_time', 
+            'id', 'title', 'venue_location', 'latitude', 'longitude', 'distance_km', 'date_time', 
             'max_group_size', 'description', 'category', 'creator', 
             'participants', 'participant_count', 'is_full', 'is_user_participant',
             'is_ended', 'ended_at', 'auto_end_date',
             'created_at', 'updated_at'
         ]
-        read_only_fields = ['id', 'creator', 'created_at', 'updated_at', 'is_ended', 'ended_at']
+        read_only_fields = [
+            'id', 'creator', 'participant_count', 'created_at', 'updated_at', 'is_ended', 'ended_at'
+        ]
     
-    def get_participant_count(self, obj):
-        return obj.participants.count()
+    expandable_fields = {
+        'creator': (UserSerializer, {}),
+        'participants': (UserSerializer, {'many': True}),
+    }
     
     def get_is_full(self, obj):
-        return obj.participants.count() >= obj.max_group_size
+        return obj.participant_count >= obj.max_group_size
     
     def get_is_user_participant(self, obj):
         """Check if the current user is a participant in this hangout"""
+        annotated = getattr(obj, 'is_user_participant', None)
+        if annotated is not None:
+            return annotated
         request = self.context.get('request')
         if request and request.user.is_authenticated:
             return obj.participants.filter(id=request.user.id).exists()
         return False
+    
+    def get_distance_km(self, obj):
+        """Distance from the searched point, only set for location searches"""
+        distance = getattr(obj, 'distance_km', None)
+        if distance is None:
+            return None
+        return round(distance, 2)
+
+
+class FriendsGoingHangoutSerializer(HangoutSerializer):
+    """Hangout with the number of the user's friends attending"""
+    friends_going = serializers.IntegerField(read_only=True)
+    
+    class Meta(HangoutSerializer.Meta):
+        fields = HangoutSerializer.Meta.fields + ['friends_going']
+
+
+class HangoutCardSerializer(serializers.Serializer):
+    """Light hangout card for lists like my hangouts, built from values() rows"""
+    id = serializers.IntegerField()
+    title = serializers.CharField()
+    summary = serializers.CharField()
+    venue_location = serializers.CharField()
+    date_time = serializers.DateTimeField()
+    category = serializers.CharField()
+    participant_count = serializers.IntegerField()
+    max_group_size = serializers.IntegerField()
+    is_ended = serializers.BooleanField()
+    is_archived = serializers.BooleanField()
 
 
 class HangoutCreateSerializer(serializers.ModelSerializer):
@@ -52,42 +124,47 @@ class HangoutCreateSerializer(serializers.ModelSerializer):
         ]
 
     def create(self, validated_data):
-        # Remove invited_friends from data before creating Hangout instance
-        invited_friends = validated_data.pop('invited_friends', [])
-        
-        # Create the hangout
-        hangout = super().create(validated_data)
-        
-        # Add invited friends as participants
-        if invited_friends:
-            from users.models import User
-            for friend_id in invited_friends:
-                try:
-                    friend = User.objects.get(id=friend_id)
-                    hangout.participants.add(friend)
-                except User.DoesNotExist:
-                    pass
-                    
-        return hangout
+        # Remove invited_friends from data before creating Hangout instance.
+        # The view invites them once the creator has joined.
+        validated_data.pop('invited_friends', None)
+        return super().create(validated_data)
 
 
 class HangoutMemoryPhotoSerializer(serializers.ModelSerializer):
     """Serializer for hangout memory photos"""
     uploaded_by = UserSerializer(read_only=True)
     image_url = serializers.SerializerMethodField()
+    renditions = serializers.SerializerMethodField()
     
     class Meta:
         model = HangoutMemoryPhoto
-        fields = ['id', 'image', 'image_url', 'caption', 'uploaded_by', 'uploaded_at']
+        fields = ['id', 'image', 'image_url', 'renditions', 'caption', 'uploaded_by', 'uploaded_at']
         read_only_fields = ['id', 'uploaded_by', 'uploaded_at']
     
+    def _absolute_url(self, url):
+        request = self.context.get('request')
+        if request:
+            return request.build_absolute_uri(url)
+        return url
+    
     def get_image_url(self, obj):
         if obj.image:
-            request = self.context.get('request')
-            if request:
-                return request.build_absolute_uri(obj.image.url)
-            return obj.image.url
+            return self._absolute_url(obj.image.url)
         return None
+    
+    def get_renditions(self, obj):
+        """
+        URLs of the resized copies, e.g. {'thumb': {'webp': url, 'jpeg': url,
+        'width': 320, 'height': 240}}. Empty until they have been rendered.
+        """
+        storage = obj.image.storage
+        return {
+            size: {
+                key: self._absolute_url(storage.url(value)) if key in ('webp', 'jpeg') else value
+                for key, value in rendition.items()
+            }
+            for size, rendition in (obj.renditions or {}).items()
+        }
 
 
 class HangoutMemorySerializer(serializers.ModelSerializer):
@@ -99,3 +176,46 @@ class HangoutMemorySerializer(serializers.ModelSerializer):
         model = HangoutMemory
         fields = ['id', 'hangout', 'photos', 'photo_count', 'created_at']
         read_only_fields = ['id', 'hangout', 'created_at']
+
+
+class ArchivedHangoutSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    """Read-only serializer giving archived hangouts the HangoutSerializer shape"""
+    creator = UserSummarySerializer(read_only=True)
+    participants = UserSummarySerializer(many=True, read_only=True)
+    is_full = serializers.SerializerMethodField()
+    is_user_participant = serializers.SerializerMethodField()
+    is_ended = serializers.ReadOnlyField()
+    is_archived = serializers.SerializerMethodField()
+    
+    class Meta:
+        model = ArchivedHangout
+        fields = [
+            'id', 'title', 'venue_location', 'latitude', 'longitude', 'date_time',
+            'max_group_size', 'description', 'category', 'creator',
+            'participants', 'participant_count', 'is_full', 'is_user_participant',
+            'is_ended', 'ended_at', 'auto_end_date', 'is_archived',
+            'created_at', 'updated_at'
+        ]
+        read_only_fields = fields
+    
+    expandable_fields = HangoutSerializer.expandable_fields
+    
+    def get_is_full(self, obj):
+        return obj.participant_count >= obj.max_group_size
+    
+    def get_is_user_participant(self, obj):
+        request = self.context.get('request')
+        if request and request.user.is_authenticated:
+            return any(user.id == request.user.id for user in obj.participants.all())
+        return False
+    
+    def get_is_archived(self, obj):
+        return True
+
+
+class ArchivedMemoryPhotoSerializer(HangoutMemoryPhotoSerializer):
+    """Serializer for memory photos of archived hangouts"""
+    
+    class Meta(HangoutMemoryPhotoSerializer.Meta):
+        model = ArchivedMemoryPhoto
+        read_only_fields = HangoutMemoryPhotoSerializer.Meta.fields
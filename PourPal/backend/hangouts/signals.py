@@ -0,0 +1,152 @@
+from django.db import transaction
+from django.db.models import F
+from django.db.models.signals import post_save, post_delete, m2m_changed
+from django.dispatch import Signal, receiver
+from users.media import track_media_references
+from users.models import Connection, Profile
+from .cache import bump_generation, bump_participants_version
+from .models import Hangout, HangoutRecommendation, HangoutMemoryPhoto, ArchivedMemoryPhoto
+from .recommendations import (
+    refresh_after_membership_change,
+    refresh_hangout_recommendations,
+    refresh_user_recommendations,
+    schedule_refresh,
+)
+from .renditions import memory_photo_names
+from .spatial import nearest_index
+
+# Sent once per batch of hangouts ended in bulk (e.g. by the auto-end
+# sweeper), with hangout_ids and ended_at. Bulk updates bypass post_save.
+hangouts_ended = Signal()
+
+# Sent inside the archiving transaction, before the hot rows are deleted,
+# with hangout_ids. Apps holding per-hangout rows copy them to their archive.
+hangouts_archived = Signal()
+
+
+def _changed_hangout_ids(instance, action, reverse, pk_set):
+    """Return the ids of the hangouts whose participants just changed"""
+    if not reverse:
+        return [instance.pk]
+    if action == 'post_clear':
+        return getattr(instance, '_cleared_hangout_ids', [])
+    return list(pk_set or [])
+
+
+@receiver(post_save, sender=Hangout)
+@receiver(post_delete, sender=Hangout)
+def mark_spatial_index_stale(sender, **kwargs):
+    """Rebuild the nearest-hangout index on its next read"""
+    nearest_index.mark_stale()
+
+
+@receiver(post_save, sender=Hangout)
+@receiver(post_delete, sender=Hangout)
+def invalidate_feed_on_hangout_change(sender, **kwargs):
+    """Drop cached feed pages when a hangout is created, updated or deleted"""
+    # Wait for the commit so a concurrent reader cannot re-cache the old rows
+    transaction.on_commit(bump_generation)
+
+
+@receiver(m2m_changed, sender=Hangout.participants.through)
+def remember_cleared_hangouts(sender, instance, action, reverse, **kwargs):
+    """The hangouts affected by user.joined_hangouts.clear() are only known beforehand"""
+    if action == 'pre_clear' and reverse:
+        instance._cleared_hangout_ids = list(
+            instance.joined_hangouts.values_list('id', flat=True)
+        )
+
+
+@receiver(m2m_changed, sender=Hangout.participants.through)
+def update_participant_count(sender, instance, action, reverse, pk_set, **kwargs):
+    """Keep Hangout.participant_count in step with the participants table"""
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    
+    hangouts = Hangout.objects.filter(
+        pk__in=_changed_hangout_ids(instance, action, reverse, pk_set)
+    )
+    if action == 'post_add':
+        # pk_set only holds the rows that were actually inserted
+        if pk_set:
+            increment = 1 if reverse else len(pk_set)
+            hangouts.update(participant_count=F('participant_count') + increment)
+    else:
+        # Removals may name users that were never members, so recount
+        hangouts.recount_participants()
+    
+    if not reverse:
+        instance.refresh_from_db(fields=['participant_count'])
+
+
+@receiver(m2m_changed, sender=Hangout.participants.through)
+def invalidate_feed_on_participant_change(sender, instance, action, reverse, pk_set, **kwargs):
+    """Drop cached feed pages and detail ETags when someone joins or leaves a hangout"""
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    
+    hangout_ids = _changed_hangout_ids(instance, action, reverse, pk_set)
+    
+    def bump():
+        bump_generation()
+        for hangout_id in hangout_ids:
+            bump_participants_version(hangout_id)
+    transaction.on_commit(bump)
+
+
+@receiver(post_save, sender=Hangout)
+def rescore_saved_hangout(sender, instance, **kwargs):
+    """Score new and edited hangouts for every user with recommendations"""
+    schedule_refresh(refresh_hangout_recommendations, [instance.pk])
+
+
+@receiver(m2m_changed, sender=Hangout.participants.through)
+def refresh_recommendations_on_participant_change(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Rescore for the members who joined or left and for their friends.
+    Fill ratios seen by everyone else catch up on the periodic refresh.
+    """
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    
+    hangout_ids = _changed_hangout_ids(instance, action, reverse, pk_set)
+    if action == 'post_clear' and not reverse:
+        # The former members are no longer known; rescore for everyone
+        schedule_refresh(refresh_hangout_recommendations, hangout_ids)
+        return
+    user_ids = [instance.pk] if reverse else list(pk_set or [])
+    schedule_refresh(refresh_after_membership_change, hangout_ids, user_ids)
+
+
+@receiver(post_save, sender=Connection)
+@receiver(post_delete, sender=Connection)
+def refresh_recommendations_on_connection_change(sender, instance, **kwargs):
+    """Friends going is part of the score"""
+    if instance.status != 'accepted':
+        return
+    schedule_refresh(refresh_user_recommendations, [instance.user_id, instance.friend_id])
+
+
+@receiver(post_save, sender=Profile)
+def refresh_recommendations_on_profile_change(sender, instance, created, **kwargs):
+    """Hobbies feed category affinity"""
+    if not created:
+        schedule_refresh(refresh_user_recommendations, [instance.user_id])
+
+
+@receiver(hangouts_ended)
+def invalidate_on_bulk_end(sender, hangout_ids, **kwargs):
+    """Drop feed pages, detail ETags and the spatial index for bulk-ended hangouts"""
+    nearest_index.mark_stale()
+    HangoutRecommendation.objects.filter(hangout_id__in=hangout_ids).delete()
+    
+    def bump():
+        bump_generation()
+        for hangout_id in hangout_ids:
+            bump_participants_version(hangout_id)
+    transaction.on_commit(bump)
+
+
+# Memory photos keep their original and renditions in deduplicated blobs
+track_media_references(HangoutMemoryPhoto, memory_photo_names)
+track_media_references(ArchivedMemoryPhoto, memory_photo_names)
@@ -0,0 +1,151 @@
+import heapq
+import threading
+import time
+from math import radians, cos, sin, asin
+from django.conf import settings
+from django.utils import timezone
+from .geo import EARTH_RADIUS_KM
+from .models import Hangout
+
+# Rebuild the index at least this often so changes made by other server
+# processes (whose signals we never see) are picked up
+DEFAULT_MAX_AGE_SECONDS = 60
+
+
+def to_unit_vector(latitude, longitude):
+    """Project a coordinate pair onto the unit sphere"""
+    lat = radians(float(latitude))
+    lon = radians(float(longitude))
+    return (cos(lat) * cos(lon), cos(lat) * sin(lon), sin(lat))
+
+
+def chord_to_km(chord_squared):
+    """Convert a squared chord length on the unit sphere to a surface distance"""
+    chord = min(chord_squared ** 0.5, 2.0)
+    return 2 * asin(chord / 2) * EARTH_RADIUS_KM
+
+
+class KDTree:
+    """
+    Static 3-d tree over unit-sphere points.
+    Euclidean (chord) distance on the sphere preserves great-circle ordering,
+    so nearest neighbours in 3-d space are also the nearest on the map.
+    """
+
+    def __init__(self, items):
+        # items: list of (hangout_id, (x, y, z))
+        self.size = len(items)
+        self.root = self._build(list(items), 0)
+
+    def _build(self, items, depth):
+        if not items:
+            return None
+        axis = depth % 3
+        items.sort(key=lambda item: item[1][axis])
+        middle = len(items) // 2
+        hangout_id, point = items[middle]
+        return (
+            point,
+            hangout_id,
+            axis,
+            self._build(items[:middle], depth + 1),
+            self._build(items[middle + 1:], depth + 1),
+        )
+
+    def nearest(self, point, k):
+        """Return up to k (chord_squared, hangout_id) pairs, closest first"""
+        if k <= 0 or self.root is None:
+            return []
+        heap = []  # max-heap of (-distance, id)
+
+        def visit(node):
+            if node is None:
+                return
+            node_point, hangout_id, axis, left, right = node
+            distance = (
+                (node_point[0] - point[0]) ** 2
+                + (node_point[1] - point[1]) ** 2
+                + (node_point[2] - point[2]) ** 2
+            )
+            if len(heap) < k:
+                heapq.heappush(heap, (-distance, hangout_id))
+            elif distance < -heap[0][0]:
+                heapq.heapreplace(heap, (-distance, hangout_id))
+
+            delta = point[axis] - node_point[axis]
+            near, far = (left, right) if delta < 0 else (right, left)
+            visit(near)
+            # Only cross the splitting plane if it is closer than the worst match
+            if len(heap) < k or delta * delta < -heap[0][0]:
+                visit(far)
+
+        visit(self.root)
+        return sorted((-distance, hangout_id) for distance, hangout_id in heap)
+
+
+class NearestHangoutIndex:
+    """
+    Process-local k-d tree over upcoming hangouts.
+
+    Hangout signals mark the index stale; the next reader rebuilds it and swaps
+    the new tree in with a single reference assignment. Readers that arrive
+    while a rebuild is running keep using the previous tree instead of waiting.
+    """
+
+    def __init__(self):
+        self._snapshot = None  # (tree, version, built_at)
+        self._version = 0
+        self._rebuild_lock = threading.Lock()
+
+    def mark_stale(self):
+        self._version += 1
+
+    def _is_fresh(self, snapshot):
+        tree, version, built_at = snapshot
+        max_age = getattr(settings, 'HANGOUT_SPATIAL_INDEX_MAX_AGE', DEFAULT_MAX_AGE_SECONDS)
+        return version == self._version and time.monotonic() - built_at < max_age
+
+    def _rebuild(self):
+        version = self._version
+        rows = Hangout.objects.filter(
+            date_time__gte=timezone.now(),
+            is_ended=False,
+            latitude__isnull=False,
+            longitude__isnull=False,
+        ).values_list('id', 'latitude', 'longitude')
+        tree = KDTree([
+            (hangout_id, to_unit_vector(latitude, longitude))
+            for hangout_id, latitude, longitude in rows.iterator()
+        ])
+        self._snapshot = (tree, version, time.monotonic())
+        return tree
+
+    def get_tree(self):
+        snapshot = self._snapshot
+        if snapshot is not None and self._is_fresh(snapshot):
+            return snapshot[0]
+
+        if snapshot is None:
+            # Nothing to fall back on yet, so the first readers wait for the build
+            with self._rebuild_lock:
+                if self._snapshot is None:
+                    return self._rebuild()
+                return self._snapshot[0]
+
+        if self._rebuild_lock.acquire(blocking=False):
+            try:
+                return self._rebuild()
+            finally:
+                self._rebuild_lock.release()
+        return snapshot[0]
+
+    def nearest(self, latitude, longitude, k):
+        """Return up to k (distance_km, hangout_id) pairs, closest first"""
+        tree = self.get_tree()
+        return [
+            (chord_to_km(chord_squared), hangout_id)
+            for chord_squared, hangout_id in tree.nearest(to_unit_vector(latitude, longitude), k)
+        ]
+
+
+nearest_index = NearestHangoutIndex()
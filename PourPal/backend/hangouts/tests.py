@@ -0,0 +1,151 @@
+from datetime import timedelta
+from io import StringIO
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from users.models import User, Profile
+from .archive import archive_hangouts
+from .geo import haversine_km
+from .models import ArchivedHangout, Hangout
+from .signals import hangouts_ended
+
+PAGE_SIZE = 50
+
+
+class HangoutFeedQueryCountTests(TestCase):
+    """
+    A feed page costs the same number of queries however many hangouts and
+    participants it holds; a per-hangout query would multiply these by 50.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        users = []
+        for i in range(4):
+            user = User.objects.create_user(
+                username=f'user{i}', email=f'user{i}@example.com', password='pass', first_name=f'User{i}'
+            )
+            Profile.objects.create(user=user)
+            users.append(user)
+        cls.user = users[0]
+
+        start = timezone.now() + timedelta(days=1)
+        for i in range(PAGE_SIZE):
+            hangout = Hangout.objects.create(
+                creator=users[i % len(users)],
+                title=f'Hangout {i}',
+                description='Drinks after work',
+                venue_location='Old Town',
+                latitude=45 + i * 0.001,
+                longitude=26,
+                date_time=start + timedelta(hours=i),
+                max_group_size=5,
+            )
+            hangout.participants.add(*users[:3])
+
+    def setUp(self):
+        # Feed pages are cached; every test measures a cold page
+        cache.clear()
+
+    def get_page(self, params=None):
+        response = self.client.get('/api/hangouts/', {'page_size': PAGE_SIZE, **(params or {})})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['results']), PAGE_SIZE)
+        return response
+
+    def test_feed_page(self):
+        # Hangouts with creators, then participants
+        with self.assertNumQueries(2):
+            response = self.get_page()
+        self.assertEqual(response.data['results'][0]['participant_count'], 3)
+
+    def test_feed_page_within_radius(self):
+        # Candidates around the grid cell, then the page's hangouts and participants
+        with self.assertNumQueries(3):
+            self.get_page({'lat': 45, 'lon': 26, 'radius': 50})
+        # The candidates are shared with nearby points
+        with self.assertNumQueries(2):
+            self.get_page({'lat': 45.001, 'lon': 26.001, 'radius': 49.5})
+
+    def test_radius_is_exact_around_the_point(self):
+        # Snapped to the grid this would be 45.00 with a 1km radius
+        lat, lon = 45.0049, 26
+        response = self.client.get('/api/hangouts/', {'lat': lat, 'lon': lon, 'radius': 0.5})
+        self.assertEqual(response.status_code, 200)
+        results = response.data['results']
+        self.assertEqual([item['title'] for item in results], [f'Hangout {i}' for i in range(1, 10)])
+        for item in results:
+            expected = haversine_km(lat, lon, float(item['latitude']), float(item['longitude']))
+            self.assertEqual(item['distance_km'], round(expected, 2))
+
+    def test_feed_page_for_signed_in_user(self):
+        self.client.force_login(self.user)
+        # Session and user, the page, then one query to mark the user's hangouts
+        with self.assertNumQueries(5):
+            response = self.get_page()
+        self.assertTrue(response.data['results'][0]['is_user_participant'])
+
+    def test_feed_page_with_expanded_users(self):
+        # Profile photos are only loaded for the expanded users
+        with self.assertNumQueries(4):
+            response = self.get_page({'expand': 'creator,participants'})
+        self.assertEqual(response.data['results'][0]['creator']['profile']['photos'], [])
+
+
+class EndExpiredHangoutsTests(TestCase):
+    """The sweeper ends hangouts past auto_end_date, but only once they took place"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='host', email='host@example.com', password='pass')
+        now = timezone.now()
+        self.held = self.create_hangout(now - timedelta(days=4))
+        # auto_end_date counts from creation, so it can pass before the event
+        self.scheduled = self.create_hangout(now + timedelta(days=10))
+        self.ended = self.create_hangout(now - timedelta(days=5), is_ended=True, ended_at=now - timedelta(days=5))
+        self.sent = []
+        hangouts_ended.connect(self.record, sender=Hangout)
+        self.addCleanup(hangouts_ended.disconnect, self.record, sender=Hangout)
+
+    def create_hangout(self, date_time, **fields):
+        return Hangout.objects.create(
+            creator=self.user,
+            title='Hangout',
+            description='Drinks',
+            venue_location='Old Town',
+            date_time=date_time,
+            auto_end_date=timezone.now() - timedelta(hours=1),
+            **fields
+        )
+
+    def record(self, sender, hangout_ids, **kwargs):
+        self.sent.extend(hangout_ids)
+
+    def test_ends_only_held_hangouts(self):
+        call_command('end_expired_hangouts', stdout=StringIO())
+        self.held.refresh_from_db()
+        self.scheduled.refresh_from_db()
+        self.assertTrue(self.held.is_ended)
+        self.assertFalse(self.scheduled.is_ended)
+        self.assertEqual(self.sent, [self.held.id])
+
+
+class ArchiveHangoutsTests(TestCase):
+    """Only hangouts that ended and took place long ago move to the archive"""
+
+    def setUp(self):
+        user = User.objects.create_user(username='host', email='host@example.com', password='pass')
+        now = timezone.now()
+        long_ago = now - timedelta(days=40)
+        fields = dict(
+            creator=user, description='Drinks', venue_location='Old Town',
+            is_ended=True, ended_at=long_ago
+        )
+        self.held = Hangout.objects.create(title='Held', date_time=long_ago, **fields)
+        # Ended early, but still ahead
+        self.scheduled = Hangout.objects.create(title='Scheduled', date_time=now + timedelta(days=5), **fields)
+
+    def test_archives_only_held_hangouts(self):
+        self.assertEqual(archive_hangouts(older_than_days=30), 1)
+        self.assertTrue(ArchivedHangout.objects.filter(id=self.held.id).exists())
+        self.assertTrue(Hangout.objects.filter(id=self.scheduled.id).exists())
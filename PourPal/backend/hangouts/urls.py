@@ -3,6 +3,7 @@ from .views import (
     HangoutListCreateView,
     HangoutDetailView,
     join_hangout,
+    invite_to_hangout,
     leave_hangout,
     my_hangouts,
     upload_memory_photo,
@@ -10,6 +11,9 @@ from .views import (
     get_hangout_memories,
     end_hangout,
     get_recommended_hangouts,
+    nearest_hangouts,
+    friends_going,
+    search_hangouts_view,
     kick_participant
 )
 
@@ -17,10 +21,14 @@ urlpatterns = [
     path('', HangoutListCreateView.as_view(), name='hangout-list-create'),
     path('<int:pk>/', HangoutDetailView.as_view(), name='hangout-detail'),
     path('<int:pk>/join/', join_hangout, name='hangout-join'),
+    path('<int:pk>/invite/', invite_to_hangout, name='hangout-invite'),
     path('<int:pk>/leave/', leave_hangout, name='hangout-leave'),
     path('<int:pk>/end/', end_hangout, name='hangout-end'),
     path('<int:pk>/kick/', kick_participant, name='hangout-kick'),
     path('my-hangouts/', my_hangouts, name='my-hangouts'),
+    path('nearest/', nearest_hangouts, name='nearest-hangouts'),
+    path('friends-going/', friends_going, name='friends-going'),
+    path('search/', search_hangouts_view, name='hangout-search'),
     path('recommended/', get_recommended_hangouts, name='recommended-hangouts'),
     path('<int:pk>/memories/', get_hangout_memories, name='hangout-memories'),
     path('<int:pk>/memories/upload/', upload_memory_photo, name='upload-memory-photo'),
@@ -1,121 +1,280 @@
+import heapq
+import time
+from datetime import date, datetime, timedelta
+from math import isfinite
+from zoneinfo import ZoneInfo
 from rest_framework import status, generics, permissions
 from rest_framework.response import Response
 from rest_framework.decorators import api_view, permission_classes
+from rest_framework.utils.urls import replace_query_param
+from django.conf import settings
+from django.http import Http404
+from django.core.cache import cache
 from django.utils import timezone
 from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import condition
 from django.utils.decorators import method_decorator
-from django.db import models
-from .models import Hangout, HangoutMemory, HangoutMemoryPhoto
+from django.db import models, transaction
+from django.db.models.functions import RowNumber, Substr
+from .models import Hangout, HangoutMemory, HangoutMemoryPhoto, ArchivedHangout
+from .geo import annotate_distance, haversine_km
+from .spatial import nearest_index
+from .invites import invite_friends
+from .recommendations import ensure_recommendations, recommended_hangouts
+from .search import search_hangouts
+from .renditions import schedule_renditions
+from users.friends import get_friend_ids
+from .pagination import KeysetPagination
+from .cache import (
+    normalize_feed_params,
+    grid_cell_params,
+    feed_cache_key,
+    get_generation,
+    get_participants_version,
+    make_etag
+)
 from .serializers import (
     HangoutSerializer, 
+    HangoutCardSerializer,
+    FriendsGoingHangoutSerializer,
     HangoutCreateSerializer,
     HangoutMemorySerializer,
-    HangoutMemoryPhotoSerializer
+    HangoutMemoryPhotoSerializer,
+    ArchivedHangoutSerializer,
+    ArchivedMemoryPhotoSerializer,
+    get_expand
 )
 
+# Limits for the nearest-hangouts endpoint
+DEFAULT_NEAREST_K = 10
+MAX_NEAREST_K = 50
+NEAREST_SLACK = 10
+
+# Most hangouts returned by the friends-going endpoint
+FRIENDS_GOING_LIMIT = 50
+
+# Most hangouts returned by a search
+SEARCH_LIMIT = 20
+
+# Columns of the light hangout cards
+CARD_FIELDS = (
+    'id', 'title', 'venue_location', 'date_time', 'category',
+    'participant_count', 'max_group_size',
+)
+CARD_SUMMARY_LENGTH = 140
+
+
+def start_of_day(day, tzinfo):
+    """Return the aware datetime at which a calendar day starts in tzinfo"""
+    return datetime.combine(date.fromisoformat(day), datetime.min.time(), tzinfo=tzinfo)
+
+
+def apply_feed_filters(queryset, params):
+    """Apply the normalized feed filters (see normalize_feed_params)"""
+    # Filter by category
+    if params['category']:
+        queryset = queryset.filter(category=params['category'])
+    
+    # Filter by date range. Days are turned into a half-open datetime range in
+    # the user's timezone so the date_time indexes can be used.
+    tzinfo = ZoneInfo(params['tz']) if params['tz'] else timezone.get_default_timezone()
+    if params['start_date']:
+        queryset = queryset.filter(date_time__gte=start_of_day(params['start_date'], tzinfo))
+    if params['end_date']:
+        end = start_of_day(params['end_date'], tzinfo) + timedelta(days=1)
+        queryset = queryset.filter(date_time__lt=end)
+    
+    # Only hangouts with a free spot
+    if params['available']:
+        queryset = queryset.not_full()
+    
+    # Filter by location radius if provided. The geohash/bounding box index
+    # prefilters and the exact distances are computed in the same query.
+    if params['radius'] is not None:
+        queryset = annotate_distance(queryset, params['lat'], params['lon'], params['radius'])
+    
+    return queryset
+
+
+def mark_user_participation(results, user):
+    """
+    Fill in is_user_participant on shared (cached) hangout data for one user,
+    with a single query over the hangouts on the page.
+    """
+    if not results or 'is_user_participant' not in results[0]:
+        return results
+    joined = set()
+    if user.is_authenticated:
+        joined = set(Hangout.participants.through.objects.filter(
+            user_id=user.id,
+            hangout_id__in=[item['id'] for item in results]
+        ).values_list('hangout_id', flat=True))
+    return [
+        {**item, 'is_user_participant': item['id'] in joined}
+        for item in results
+    ]
+
+
+def feed_etag(request, *args, **kwargs):
+    """
+    ETag for a feed page, computed without touching the database.
+    The generation changes with any hangout or participant change; the time
+    bucket follows the cache timeout because the 'upcoming' window moves.
+    """
+    time_bucket = int(time.time() // max(settings.HANGOUT_FEED_CACHE_TIMEOUT, 1))
+    return make_etag(
+        'feed',
+        get_generation(),
+        normalize_feed_params(request.query_params),
+        request.user.id,
+        time_bucket
+    )
+
+
+def hangout_etag(request, pk, *args, **kwargs):
+    """ETag for a hangout from its updated_at and participant-set version"""
+    updated_at = Hangout.objects.filter(pk=pk).values_list('updated_at', flat=True).first()
+    kind = 'hangout'
+    if updated_at is None:
+        # Archived hangouts never change again
+        updated_at = ArchivedHangout.objects.filter(pk=pk).values_list('archived_at', flat=True).first()
+        kind = 'archived'
+    if updated_at is None:
+        return None
+    return make_etag(
+        kind,
+        pk,
+        updated_at.isoformat(),
+        get_participants_version(pk),
+        request.query_params.get('fields'),
+        request.query_params.get('expand'),
+        request.user.id
+    )
+
 
 @method_decorator(csrf_exempt, name='dispatch')
+@method_decorator(condition(etag_func=feed_etag), name='get')
 class HangoutListCreateView(generics.ListCreateAPIView):
     """API endpoint for listing and creating hangouts"""
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+    pagination_class = KeysetPagination
     
     def get_serializer_class(self):
         if self.request.method == 'POST':
             return HangoutCreateSerializer
         return HangoutSerializer
     
+    def get_feed_params(self):
+        if not hasattr(self, '_feed_params'):
+            self._feed_params = normalize_feed_params(self.request.query_params)
+        return self._feed_params
+    
     def get_queryset(self):
-        # Start with all upcoming hangouts
+        # Start with all upcoming hangouts. Participation is left out here so
+        # the result can be cached and shared between users.
         queryset = Hangout.objects.filter(
             date_time__gte=timezone.now()
-        ).order_by('date_time')
-        
-        # Filter by category
-        category = self.request.query_params.get('category')
-        if category and category != 'all':
-            queryset = queryset.filter(category=category)
-            
-        # Filter by date range (accept snake_case or camelCase)
-        start_date = self.request.query_params.get('start_date') or self.request.query_params.get('startDate')
-        end_date = self.request.query_params.get('end_date') or self.request.query_params.get('endDate')
+        ).order_by('date_time', 'id').with_participant_stats(expand=get_expand(self.request))
         
-        if start_date:
-            queryset = queryset.filter(date_time__date__gte=start_date)
-        if end_date:
-            queryset = queryset.filter(date_time__date__lte=end_date)
-            
         # Exclude hangouts the user has already joined or created (Discovery Mode)
         # if self.request.user.is_authenticated:
         #     queryset = queryset.exclude(participants=self.request.user)
             
-        return queryset
+        return apply_feed_filters(queryset, self.get_feed_params())
 
-    def list(self, request, *args, **kwargs):
-        queryset = self.get_queryset()
+    def get_radius_page(self, params):
+        """
+        A page of a radius search. The candidates around the grid cell are
+        cached and shared; the exact radius, distances and page are worked
+        out for this request's point.
+        """
+        cell = grid_cell_params(params)
+        cache_key = feed_cache_key(cell, 'cell')
+        candidates = cache.get(cache_key)
+        if candidates is None:
+            candidates = list(apply_feed_filters(
+                Hangout.objects.filter(date_time__gte=timezone.now()), cell
+            ).order_by('date_time', 'id').values_list('date_time', 'id', 'latitude', 'longitude'))
+            cache.set(cache_key, candidates, settings.HANGOUT_FEED_CACHE_TIMEOUT)
         
-        # Filter by location radius if provided
-        lat = request.query_params.get('lat')
-        lon = request.query_params.get('lon')
-        radius = request.query_params.get('radius') # in km
+        now = timezone.now()
+        cursor = self.paginator.get_cursor(self.request)
+        page_size = self.paginator.get_page_size(self.request)
+        distances = {}
+        for date_time, pk, latitude, longitude in candidates:
+            if date_time < now or (cursor is not None and (date_time, pk) <= cursor):
+                continue
+            distance = haversine_km(params['lat'], params['lon'], latitude, longitude)
+            if distance <= params['radius']:
+                distances[pk] = distance
+                # One extra row tells whether there is a next page
+                if len(distances) > page_size:
+                    break
         
-        if lat and lon and radius:
-            try:
-                user_lat = float(lat)
-                user_lon = float(lon)
-                radius_km = float(radius)
-                
-                # Filter in Python (simple Haversine implementation)
-                filtered_hangouts = []
-                from math import radians, cos, sin, asin, sqrt
-                
-                def haversine(lon1, lat1, lon2, lat2):
-                    # Convert decimal degrees to radians 
-                    lon1, lat1, lon2, lat2 = map(radians, [lon1, lat1, lon2, lat2])
-                    # Haversine formula 
-                    dlon = lon2 - lon1 
-                    dlat = lat2 - lat1 
-                    a = sin(dlat/2)**2 + cos(lat1) * cos(lat2) * sin(dlon/2)**2
-                    c = 2 * asin(sqrt(a)) 
-                    r = 6371 # Radius of earth in kilometers
-                    return c * r
-                
-                for hangout in queryset:
-                    if hangout.latitude and hangout.longitude:
-                        dist = haversine(user_lon, user_lat, float(hangout.longitude), float(hangout.latitude))
-                        if dist <= radius_km:
-                            filtered_hangouts.append(hangout)
-                
-                queryset = filtered_hangouts
-            except (ValueError, TypeError):
-                pass # Ignore invalid coordinates/radius
+        hangouts = list(Hangout.objects.filter(id__in=distances).order_by('date_time', 'id').with_participant_stats(
+            expand=get_expand(self.request)
+        ))
+        for hangout in hangouts:
+            hangout.distance_km = distances[hangout.id]
+        page = self.paginator.set_page(self.request, hangouts)
+        serializer = self.get_serializer(page, many=True)
+        return self.paginator.get_paginated_data(serializer.data)
+    
+    def list(self, request, *args, **kwargs):
+        params = self.get_feed_params()
+        if params['radius'] is not None:
+            data = self.get_radius_page(params)
+        else:
+            cache_key = feed_cache_key(params)
+            data = cache.get(cache_key)
+            if data is None:
+                # Keyset pagination on (date_time, id)
+                page = self.paginate_queryset(self.get_queryset())
+                serializer = self.get_serializer(page, many=True)
+                data = self.paginator.get_paginated_data(serializer.data)
+                cache.set(cache_key, data, settings.HANGOUT_FEED_CACHE_TIMEOUT)
         
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(serializer.data)
+        data = dict(data)
+        if data['next_cursor']:
+            # Build the link from this request rather than the one that filled the cache
+            data['next'] = replace_query_param(
+                request.build_absolute_uri(), 'cursor', data['next_cursor']
+            )
+        data['results'] = mark_user_participation(data['results'], request.user)
+        return Response(data)
     
     def perform_create(self, serializer):
         # Set the creator and add them as a participant
         hangout = serializer.save(creator=self.request.user)
         hangout.participants.add(self.request.user)
         
-        # Add invited friends as participants
-        invited_friends = self.request.data.get('invited_friends', [])
+        # Add invited friends as participants, in bulk
+        invited_friends = serializer.validated_data.get('invited_friends')
         if invited_friends:
-            from users.models import User
-            for friend_id in invited_friends:
-                try:
-                    friend = User.objects.get(id=friend_id)
-                    hangout.participants.add(friend)
-                except User.DoesNotExist:
-                    pass  # Skip invalid friend IDs
+            invite_friends(hangout.pk, self.request.user, invited_friends)
 
 
 @method_decorator(csrf_exempt, name='dispatch')
+@method_decorator(condition(etag_func=hangout_etag), name='get')
 class HangoutDetailView(generics.RetrieveUpdateDestroyAPIView):
     """API endpoint for retrieving, updating, or deleting a hangout"""
-    queryset = Hangout.objects.all()
     serializer_class = HangoutSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
     
+    def get_queryset(self):
+        return Hangout.objects.with_participant_stats(self.request.user, get_expand(self.request))
+    
+    def retrieve(self, request, *args, **kwargs):
+        try:
+            return super().retrieve(request, *args, **kwargs)
+        except Http404:
+            # Long-ended hangouts live in the archive
+            archived = ArchivedHangout.objects.with_participants(get_expand(request)).filter(pk=kwargs['pk']).first()
+            if archived is None:
+                raise
+            serializer = ArchivedHangoutSerializer(archived, context=self.get_serializer_context())
+            return Response(serializer.data)
+    
     def delete(self, request, *args, **kwargs):
         hangout = self.get_object()
         if hangout.creator != request.user:
@@ -130,35 +289,98 @@ class HangoutDetailView(generics.RetrieveUpdateDestroyAPIView):
 @permission_classes([permissions.IsAuthenticated])
 def join_hangout(request, pk):
     """API endpoint for joining a hangout"""
+    memberships = Hangout.participants.through.objects.filter(
+        hangout=models.OuterRef('pk'), user_id=request.user.id
+    )
+    kicked = Hangout.kicked_users.through.objects.filter(
+        hangout=models.OuterRef('pk'), user_id=request.user.id
+    )
+    
+    with transaction.atomic():
+        # Lock the hangout row so concurrent joins are serialized, and load
+        # every check with it in a single query
+        hangout = Hangout.objects.select_for_update().filter(pk=pk).annotate(
+            is_member=models.Exists(memberships),
+            is_kicked=models.Exists(kicked),
+        ).first()
+        
+        if hangout is None:
+            return Response({
+                'error': 'Hangout not found'
+            }, status=status.HTTP_404_NOT_FOUND)
+        
+        # Check if user has been kicked from this hangout
+        if hangout.is_kicked:
+            return Response({
+                'error': "You've been kicked from this hangout"
+            }, status=status.HTTP_403_FORBIDDEN)
+        
+        # Check if hangout is full
+        if hangout.participant_count >= hangout.max_group_size:
+            return Response({
+                'error': 'This hangout is full'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        # Check if user is already a participant
+        if hangout.is_member:
+            return Response({
+                'error': 'You are already in this hangout'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        hangout.participants.add(request.user)
+    
+    hangout = Hangout.objects.with_participant_stats(request.user, get_expand(request)).get(pk=pk)
+    return Response({
+        'message': 'Successfully joined hangout',
+        'hangout': HangoutSerializer(hangout, context={'request': request}).data
+    }, status=status.HTTP_200_OK)
+
+
+@csrf_exempt
+@api_view(['POST'])
+@permission_classes([permissions.IsAuthenticated])
+def invite_to_hangout(request, pk):
+    """API endpoint for inviting many friends to a hangout at once"""
+    user_ids = request.data.get('user_ids')
+    if not isinstance(user_ids, list) or not user_ids:
+        return Response({
+            'error': 'user_ids must be a non-empty list'
+        }, status=status.HTTP_400_BAD_REQUEST)
     try:
-        hangout = Hangout.objects.get(pk=pk)
-    except Hangout.DoesNotExist:
+        user_ids = [int(user_id) for user_id in user_ids]
+    except (TypeError, ValueError):
+        return Response({
+            'error': 'user_ids must be a list of user ids'
+        }, status=status.HTTP_400_BAD_REQUEST)
+    
+    hangout = Hangout.objects.filter(pk=pk).annotate(
+        is_member=models.Exists(Hangout.participants.through.objects.filter(
+            hangout=models.OuterRef('pk'), user_id=request.user.id
+        ))
+    ).first()
+    if hangout is None:
         return Response({
             'error': 'Hangout not found'
         }, status=status.HTTP_404_NOT_FOUND)
     
-    # Check if user has been kicked from this hangout
-    if request.user in hangout.kicked_users.all():
+    # Only participants can invite their friends
+    if not hangout.is_member:
         return Response({
-            'error': "You've been kicked from this hangout"
+            'error': 'Only participants can invite friends'
         }, status=status.HTTP_403_FORBIDDEN)
     
-    # Check if hangout is full
-    if hangout.participants.count() >= hangout.max_group_size:
+    if hangout.is_ended:
         return Response({
-            'error': 'This hangout is full'
+            'error': 'This hangout has ended'
         }, status=status.HTTP_400_BAD_REQUEST)
     
-    # Check if user is already a participant
-    if request.user in hangout.participants.all():
-        return Response({
-            'error': 'You are already in this hangout'
-        }, status=status.HTTP_400_BAD_REQUEST)
+    result = invite_friends(hangout.pk, request.user, user_ids)
     
-    hangout.participants.add(request.user)
+    hangout = Hangout.objects.with_participant_stats(request.user, get_expand(request)).get(pk=pk)
     return Response({
-        'message': 'Successfully joined hangout',
-        'hangout': HangoutSerializer(hangout).data
+        'message': f"Invited {len(result['invited'])} friends",
+        **result,
+        'hangout': HangoutSerializer(hangout, context={'request': request}).data
     }, status=status.HTTP_200_OK)
 
 
@@ -197,25 +419,88 @@ def leave_hangout(request, pk):
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
 def my_hangouts(request):
-    """API endpoint for getting user's hangouts"""
-    # Upcoming: future hangouts that are not ended
-    upcoming = Hangout.objects.filter(
-        participants=request.user,
-        date_time__gte=timezone.now(),
-        is_ended=False
-    ).order_by('date_time')
+    """
+    API endpoint for getting user's hangouts as light cards.
+    Upcoming and past are paginated independently with upcoming_cursor and
+    past_cursor; ?section=upcoming or ?section=past loads only one side.
+    """
+    now = timezone.now()
+    section = request.query_params.get('section')
+    sides = {
+        'upcoming': KeysetPagination(cursor_query_param='upcoming_cursor'),
+        'past': KeysetPagination(cursor_query_param='past_cursor', descending=True),
+    }
+    if section in sides:
+        sides = {section: sides[section]}
+    page_size = KeysetPagination().get_page_size(request)
     
+    # Upcoming: future hangouts that are not ended
     # Past: past hangouts OR ended hangouts (regardless of date)
-    past = Hangout.objects.filter(
-        participants=request.user
-    ).filter(
-        models.Q(date_time__lt=timezone.now()) | models.Q(is_ended=True)
-    ).order_by('-date_time')
-    
-    return Response({
-        'upcoming': HangoutSerializer(upcoming, many=True).data,
-        'past': HangoutSerializer(past, many=True).data
-    }, status=status.HTTP_200_OK)
+    bucket = models.Case(
+        models.When(models.Q(date_time__gte=now, is_ended=False), then=models.Value('upcoming')),
+        default=models.Value('past'),
+        output_field=models.CharField()
+    )
+    after_cursor = models.Q(pk__in=[])
+    for name, paginator in sides.items():
+        after_cursor |= models.Q(bucket=name) & paginator.cursor_filter(request)
+    
+    # Number the rows of each side in its own order and keep one page (plus
+    # one row to detect a next page) of each, all in one query
+    def row_number(*ordering):
+        return models.Window(
+            expression=RowNumber(),
+            partition_by=[models.F('bucket')],
+            order_by=list(ordering)
+        )
+    position = models.Case(
+        models.When(bucket='upcoming', then=row_number(models.F('date_time').asc(), models.F('id').asc())),
+        default=row_number(models.F('date_time').desc(), models.F('id').desc()),
+    )
+    cards = dict(
+        summary=Substr('description', 1, CARD_SUMMARY_LENGTH),
+        is_archived=models.Value(False),
+    )
+    rows = Hangout.objects.filter(participants=request.user).annotate(
+        bucket=bucket
+    ).filter(after_cursor).annotate(
+        position=position
+    ).filter(position__lte=page_size + 1).values(*CARD_FIELDS, 'is_ended', 'bucket', **cards)
+    
+    buckets = {name: [] for name in sides}
+    for row in rows:
+        buckets[row.pop('bucket')].append(row)
+    
+    response = {}
+    for name, paginator in sides.items():
+        side_rows = sorted(
+            buckets[name],
+            key=lambda row: (row['date_time'], row['id']),
+            reverse=paginator.descending
+        )
+        if name == 'past':
+            # Archived hangouts are past too; merge both newest first
+            archived = ArchivedHangout.objects.filter(
+                participants=request.user
+            ).filter(
+                paginator.cursor_filter(request)
+            ).order_by('-date_time', '-id').values(
+                *CARD_FIELDS, **{
+                    **cards,
+                    'is_ended': models.Value(True),
+                    'is_archived': models.Value(True),
+                }
+            )[:page_size + 1]
+            side_rows = list(heapq.merge(
+                side_rows, archived,
+                key=lambda row: (row['date_time'], row['id']),
+                reverse=True
+            ))[:page_size + 1]
+        page = paginator.set_page(request, side_rows)
+        response[name] = HangoutCardSerializer(page, many=True).data
+        response[f'{name}_next_cursor'] = paginator.get_next_cursor()
+    
+    return Response(response, status=status.HTTP_200_OK)
 
 
 @csrf_exempt
@@ -254,7 +539,9 @@ def upload_memory_photo(request, pk):
     # Create memory photo
     serializer = HangoutMemoryPhotoSerializer(data=request.data, context={'request': request})
     if serializer.is_valid():
-        serializer.save(memory=memory, uploaded_by=request.user)
+        photo = serializer.save(memory=memory, uploaded_by=request.user)
+        # Thumbnails are rendered off the request; renditions stay empty until then
+        schedule_renditions(photo.id)
         return Response(serializer.data, status=status.HTTP_201_CREATED)
     
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
@@ -295,9 +582,17 @@ def get_hangout_memories(request, pk):
         hangout = Hangout.objects.get(pk=pk)
         memory = hangout.memory
     except Hangout.DoesNotExist:
+        archived = ArchivedHangout.objects.filter(pk=pk).first()
+        if archived is None:
+            return Response({
+                'error': 'Hangout not found'
+            }, status=status.HTTP_404_NOT_FOUND)
+        photos = archived.memory_photos.select_related('uploaded_by')
         return Response({
-            'error': 'Hangout not found'
-        }, status=status.HTTP_404_NOT_FOUND)
+            'hangout': archived.id,
+            'photos': ArchivedMemoryPhotoSerializer(photos, many=True, context={'request': request}).data,
+            'photo_count': len(photos)
+        }, status=status.HTTP_200_OK)
     except HangoutMemory.DoesNotExist:
         return Response({
             'photos': [],
@@ -345,36 +640,124 @@ def end_hangout(request, pk):
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
 def get_recommended_hangouts(request):
-    """API endpoint for getting recommended hangouts based on user hobbies"""
+    """API endpoint for getting recommended hangouts, best match first"""
     from .utils import get_user_category_preferences
     
+    # Scores are precomputed; only a user's first visit computes them
+    ensure_recommendations(request.user.id)
+    recommended = recommended_hangouts(request.user).with_participant_stats(
+        request.user, get_expand(request)
+    )[:5]
+    recommended = HangoutSerializer(recommended, many=True, context={'request': request}).data
+    
     # Get user's preferred categories
     preferred_categories = get_user_category_preferences(request.user)
     
-    if not preferred_categories:
+    if not recommended and not preferred_categories:
         return Response({
             'recommended': [],
             'message': 'Add hobbies to your profile to get recommendations!'
         }, status=status.HTTP_200_OK)
-        
-    # Filter upcoming hangouts by these categories
-    # Exclude hangouts the user created or already joined
-    recommended = Hangout.objects.filter(
-        category__in=preferred_categories,
-        date_time__gte=timezone.now(),
-        is_ended=False
-    ).exclude(
-        creator=request.user
-    ).exclude(
-        participants=request.user
-    ).order_by('date_time')[:5]  # Limit to 5 recommendations
     
     return Response({
-        'recommended': HangoutSerializer(recommended, many=True).data,
+        'recommended': recommended,
         'categories': preferred_categories
     }, status=status.HTTP_200_OK)
 
 
+@csrf_exempt
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticatedOrReadOnly])
+def search_hangouts_view(request):
+    """API endpoint for full-text search over upcoming hangouts"""
+    query = request.query_params.get('q', '').strip()
+    if not query:
+        return Response({
+            'error': 'q is required'
+        }, status=status.HTTP_400_BAD_REQUEST)
+    
+    # Same filters as the feed: category, date range and radius
+    queryset = apply_feed_filters(
+        Hangout.objects.filter(date_time__gte=timezone.now()),
+        normalize_feed_params(request.query_params)
+    )
+    hangouts = search_hangouts(queryset, query).order_by(
+        '-search_rank', 'date_time', 'id'
+    ).with_participant_stats(request.user, get_expand(request))[:SEARCH_LIMIT]
+    
+    serializer = HangoutSerializer(hangouts, many=True, context={'request': request})
+    return Response(serializer.data, status=status.HTTP_200_OK)
+
+
+@csrf_exempt
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def friends_going(request):
+    """API endpoint for upcoming hangouts the user's friends have joined"""
+    friend_ids = get_friend_ids(request.user.id)
+    if not friend_ids:
+        return Response([], status=status.HTTP_200_OK)
+    
+    # Filtering on the participants join before annotating makes the count
+    # cover only the friends, all in one grouped query
+    hangouts = Hangout.objects.filter(
+        date_time__gte=timezone.now(),
+        is_ended=False,
+        participants__in=friend_ids
+    ).annotate(
+        friends_going=models.Count('participants')
+    ).order_by('-friends_going', 'date_time', 'id').with_participant_stats(
+        request.user, get_expand(request)
+    )[:FRIENDS_GOING_LIMIT]
+    
+    serializer = FriendsGoingHangoutSerializer(hangouts, many=True, context={'request': request})
+    return Response(serializer.data, status=status.HTTP_200_OK)
+
+
+@csrf_exempt
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticatedOrReadOnly])
+def nearest_hangouts(request):
+    """API endpoint for getting the K closest upcoming hangouts to a point"""
+    try:
+        lat = float(request.query_params['lat'])
+        lon = float(request.query_params['lon'])
+        k = int(request.query_params.get('k', DEFAULT_NEAREST_K))
+        if not (isfinite(lat) and isfinite(lon)):
+            raise ValueError('Coordinates must be finite')
+    except (KeyError, ValueError, TypeError):
+        return Response({
+            'error': 'lat and lon are required and k must be a number'
+        }, status=status.HTTP_400_BAD_REQUEST)
+    
+    if k < 1 or k > MAX_NEAREST_K:
+        return Response({
+            'error': f'k must be between 1 and {MAX_NEAREST_K}'
+        }, status=status.HTTP_400_BAD_REQUEST)
+    
+    # The index may still hold hangouts that have started or ended since it
+    # was built, so over-fetch and keep doubling until k of them are still
+    # upcoming or the tree has nothing more to give
+    upcoming = Hangout.objects.filter(date_time__gte=timezone.now(), is_ended=False)
+    fetch = k + NEAREST_SLACK
+    while True:
+        matches = nearest_index.nearest(lat, lon, fetch)
+        distances = {hangout_id: distance for distance, hangout_id in matches}
+        live_ids = set(upcoming.filter(id__in=distances.keys()).values_list('id', flat=True))
+        if len(live_ids) >= k or len(matches) < fetch:
+            break
+        fetch *= 2
+    
+    nearest_ids = sorted(live_ids, key=distances.get)[:k]
+    hangouts = upcoming.filter(id__in=nearest_ids).with_participant_stats(request.user, get_expand(request))
+    hangouts = sorted(hangouts, key=lambda hangout: distances[hangout.id])
+    for hangout in hangouts:
+        hangout.distance_km = distances[hangout.id]
+    
+    serializer = HangoutSerializer(hangouts, many=True, context={'request': request})
+    return Response(serializer.data, status=status.HTTP_200_OK)
+
+
 @csrf_exempt
 @api_view(['POST'])
 @permission_classes([permissions.IsAuthenticated])
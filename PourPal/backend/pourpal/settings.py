@@ -103,6 +103,35 @@ else:
         },
     }
 
+# Cache
+# Shared Redis cache in production, per-process memory cache for development
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+            'OPTIONS': {
+                'ssl_cert_reqs': None,  # Same Upstash setup as the channel layer
+            } if REDIS_URL.startswith('rediss://') else {},
+        },
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'pourpal',
+        },
+    }
+
+# Seconds a cached hangout feed page may be served before it is rebuilt
+HANGOUT_FEED_CACHE_TIMEOUT = int(os.environ.get('HANGOUT_FEED_CACHE_TIMEOUT', 60))
+
+# Ended hangouts older than this are moved to the archive tables by archive_hangouts
+HANGOUT_ARCHIVE_AFTER_DAYS = int(os.environ.get('HANGOUT_ARCHIVE_AFTER_DAYS', 30))
+
+# Threads rendering memory photo thumbnails after upload
+MEMORY_PHOTO_RENDITION_WORKERS = int(os.environ.get('MEMORY_PHOTO_RENDITION_WORKERS', 2))
+
 # Database
 # https://docs.djangoproject.com/en/4.0/ref/settings/#databases
 
@@ -171,6 +200,12 @@ STATIC_URL = '/static/'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+# Uploads are stored once per distinct content and reference counted
+DEFAULT_FILE_STORAGE = 'pourpal.storage.ContentAddressedStorage'
+
+# Unreferenced blobs are kept this long before collect_media_blobs removes them
+MEDIA_BLOB_GRACE_SECONDS = int(os.environ.get('MEDIA_BLOB_GRACE_SECONDS', 24 * 60 * 60))
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/4.0/ref/settings/#default-auto-field
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
@@ -0,0 +1,84 @@
+import hashlib
+import os
+import tempfile
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage
+from django.utils import timezone
+from django.views.static import serve
+
+# Every stored file lives under this directory, named after its digest
+BLOB_PREFIX = 'blobs'
+
+# Blob URLs never change content, so browsers and CDNs may keep them forever
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+
+def blob_name(digest, extension):
+    """Fan blobs out over two directory levels to keep directories small"""
+    return f'{BLOB_PREFIX}/{digest[:2]}/{digest[2:4]}/{digest}{extension}'
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    File storage that keeps each distinct upload once, under its SHA-256.
+
+    The digest is computed while the upload is streamed to a temporary file
+    next to the blobs, which is then moved into place (or dropped when the
+    same content is already stored). The name passed in only contributes
+    its extension. Rows referencing a blob are counted in users.MediaBlob.
+    """
+
+    def get_available_name(self, name, max_length=None):
+        # Equal names mean equal content, so there is nothing to avoid
+        return name
+
+    def _save(self, name, content):
+        from users.models import MediaBlob
+
+        extension = os.path.splitext(name)[1].lower()
+        temp_dir = self.path(os.path.join(BLOB_PREFIX, 'tmp'))
+        os.makedirs(temp_dir, exist_ok=True)
+
+        digest = hashlib.sha256()
+        size = 0
+        handle, temp_path = tempfile.mkstemp(dir=temp_dir)
+        try:
+            with os.fdopen(handle, 'wb') as temp_file:
+                if hasattr(content, 'seek'):
+                    content.seek(0)
+                for chunk in content.chunks():
+                    digest.update(chunk)
+                    size += len(chunk)
+                    temp_file.write(chunk)
+
+            name = blob_name(digest.hexdigest(), extension)
+            full_path = self.path(name)
+            if os.path.exists(full_path):
+                os.remove(temp_path)
+            else:
+                os.makedirs(os.path.dirname(full_path), exist_ok=True)
+                if self.file_permissions_mode is not None:
+                    os.chmod(temp_path, self.file_permissions_mode)
+                # Atomic on one filesystem, so readers never see a partial blob
+                os.replace(temp_path, full_path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+        blob, created = MediaBlob.objects.get_or_create(
+            name=name,
+            defaults={'digest': digest.hexdigest(), 'size': size}
+        )
+        if not created:
+            # Restart the grace period so collection doesn't race this upload
+            MediaBlob.objects.filter(pk=blob.pk).update(updated_at=timezone.now())
+        return name
+
+
+def serve_media(request, path):
+    """Serve media files, marking content-addressed blobs as immutable"""
+    response = serve(request, path, document_root=settings.MEDIA_ROOT)
+    if path.startswith(BLOB_PREFIX + '/'):
+        response['Cache-Control'] = IMMUTABLE_CACHE_CONTROL
+    return response
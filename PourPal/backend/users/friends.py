@@ -0,0 +1,97 @@
+from collections import namedtuple
+from django.core.cache import cache
+from django.db import models
+from .models import Connection
+
+FRIEND_IDS_KEY = 'users:{id}:friend_ids'
+FRIEND_IDS_TIMEOUT = 60 * 60 * 24
+
+FRIEND_INDEX_KEY = 'users:{id}:friend_index'
+
+# One friend as shown in lists and pickers; index entries sort by (sort_key, id)
+FriendEntry = namedtuple('FriendEntry', 'sort_key id connection_id first_name username avatar')
+
+
+def _load_friend_ids(user_ids):
+    """Read the accepted friends of many users with one query"""
+    friends = {user_id: set() for user_id in user_ids}
+    for user_id, friend_id in Connection.objects.filter(status='accepted').filter(
+        models.Q(user_id__in=user_ids) | models.Q(friend_id__in=user_ids)
+    ).values_list('user_id', 'friend_id'):
+        if user_id in friends:
+            friends[user_id].add(friend_id)
+        if friend_id in friends:
+            friends[friend_id].add(user_id)
+    return {user_id: frozenset(ids) for user_id, ids in friends.items()}
+
+
+def get_many_friend_ids(user_ids):
+    """Return {user_id: frozenset of friend ids}, loading cache misses in one query"""
+    user_ids = set(user_ids)
+    keys = {FRIEND_IDS_KEY.format(id=user_id): user_id for user_id in user_ids}
+    found = {keys[key]: ids for key, ids in cache.get_many(keys).items()}
+
+    missing = user_ids - found.keys()
+    if missing:
+        loaded = _load_friend_ids(missing)
+        cache.set_many(
+            {FRIEND_IDS_KEY.format(id=user_id): ids for user_id, ids in loaded.items()},
+            FRIEND_IDS_TIMEOUT
+        )
+        found.update(loaded)
+    return found
+
+
+def get_friend_ids(user_id):
+    """Return the ids of a user's accepted friends"""
+    return get_many_friend_ids([user_id])[user_id]
+
+
+def are_friends(user_id, other_id):
+    """Whether two users are friends, answered from the cached friend set"""
+    return other_id in get_friend_ids(user_id)
+
+
+def _load_friend_index(user_id):
+    """Read a user's friends with their display fields in one joined query"""
+    connections = Connection.objects.filter(status='accepted').filter(
+        models.Q(user_id=user_id) | models.Q(friend_id=user_id)
+    ).values_list(
+        'id', 'user_id', 'friend_id',
+        'user__first_name', 'user__username', 'user__profile__primary_photo_image',
+        'friend__first_name', 'friend__username', 'friend__profile__primary_photo_image',
+    )
+    entries = []
+    for connection_id, sender_id, receiver_id, *display in connections:
+        # display holds the sender's fields, then the receiver's
+        if sender_id == user_id:
+            friend_id, (first_name, username, avatar) = receiver_id, display[3:]
+        else:
+            friend_id, (first_name, username, avatar) = sender_id, display[:3]
+        sort_key = (first_name or username).casefold()
+        entries.append(FriendEntry(sort_key, friend_id, connection_id, first_name, username, avatar or ''))
+    entries.sort(key=lambda entry: (entry.sort_key, entry.id))
+    return entries
+
+
+def get_friend_index(user_id):
+    """Return a user's friends as FriendEntry tuples sorted by name"""
+    key = FRIEND_INDEX_KEY.format(id=user_id)
+    entries = cache.get(key)
+    if entries is None:
+        entries = _load_friend_index(user_id)
+        cache.set(key, entries, FRIEND_IDS_TIMEOUT)
+    return entries
+
+
+def invalidate_friend_ids(*user_ids):
+    """Drop the cached friend sets and indexes of user_ids"""
+    cache.delete_many(
+        [FRIEND_IDS_KEY.format(id=user_id) for user_id in user_ids] +
+        [FRIEND_INDEX_KEY.format(id=user_id) for user_id in user_ids]
+    )
+
+
+def invalidate_friend_display(user_id):
+    """Drop the friend indexes that show user_id, after their name or avatar changed"""
+    cache.delete_many([FRIEND_INDEX_KEY.format(id=friend_id) for friend_id in get_friend_ids(user_id)])
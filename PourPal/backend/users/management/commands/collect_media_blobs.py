@@ -0,0 +1,41 @@
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+from users.media import unreferenced_blobs
+
+DEFAULT_GRACE_SECONDS = 24 * 60 * 60
+
+
+class Command(BaseCommand):
+    help = 'Delete stored media blobs that no row has referenced for the grace period'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--grace-seconds',
+            type=int,
+            default=None,
+            help='Defaults to MEDIA_BLOB_GRACE_SECONDS'
+        )
+        parser.add_argument('--dry-run', action='store_true')
+
+    def handle(self, *args, **options):
+        grace_seconds = options['grace_seconds']
+        if grace_seconds is None:
+            grace_seconds = getattr(settings, 'MEDIA_BLOB_GRACE_SECONDS', DEFAULT_GRACE_SECONDS)
+
+        collected = 0
+        freed = 0
+        for blob in unreferenced_blobs(grace_seconds).iterator():
+            if options['dry_run']:
+                self.stdout.write(f'Would delete {blob.name} ({blob.size} bytes)')
+                collected += 1
+                freed += blob.size
+                continue
+            # Re-check the row as it is deleted; it may have been reused since the scan
+            deleted, _ = unreferenced_blobs(grace_seconds).filter(pk=blob.pk).delete()
+            if deleted:
+                default_storage.delete(blob.name)
+                collected += 1
+                freed += blob.size
+
+        self.stdout.write(self.style.SUCCESS(f'Deleted {collected} blobs ({freed} bytes)'))
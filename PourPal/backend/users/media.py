@@ -0,0 +1,81 @@
+"""
+Reference counting for media blobs.
+
+Rows holding files are tracked with track_media_references: the names they
+reference are remembered when the row is loaded, and saving or deleting it
+adjusts the MediaBlob counts by the difference. Code that copies file names
+with bulk operations calls retain_media and release_media itself.
+"""
+from collections import Counter
+from datetime import timedelta
+from django.db.models import F
+from django.db.models.signals import post_init, post_save, post_delete
+from django.utils import timezone
+from .models import MediaBlob
+
+_LOADED_NAMES = '_media_names'
+
+
+def _adjust(names, direction):
+    counts = Counter(name for name in names if name)
+    # One update per distinct count, usually a single query
+    by_count = {}
+    for name, count in counts.items():
+        by_count.setdefault(count, []).append(name)
+    for count, batch in by_count.items():
+        MediaBlob.objects.filter(name__in=batch).update(
+            refcount=F('refcount') + direction * count,
+            updated_at=timezone.now()
+        )
+
+
+def retain_media(names):
+    """Count one more reference to each named blob"""
+    _adjust(names, 1)
+
+
+def release_media(names):
+    """Count one reference less to each named blob"""
+    _adjust(names, -1)
+
+
+def file_name(instance, attname):
+    """
+    The stored name of a file field, read without going through the
+    descriptor so deferred fields are not loaded just to track them.
+    """
+    value = instance.__dict__.get(attname)
+    return getattr(value, 'name', value) or None
+
+
+def track_media_references(model, get_names):
+    """
+    Keep blob refcounts in step with the rows of model.
+    get_names(instance) returns the storage names the row references.
+    """
+    uid = f'media_references_{model._meta.label_lower}'
+
+    def remember(sender, instance, **kwargs):
+        setattr(instance, _LOADED_NAMES, Counter(get_names(instance)))
+
+    def saved(sender, instance, created, **kwargs):
+        # A new row held an unsaved upload, not a stored name, when built
+        before = Counter() if created else getattr(instance, _LOADED_NAMES, Counter())
+        after = Counter(get_names(instance))
+        retain_media((after - before).elements())
+        release_media((before - after).elements())
+        setattr(instance, _LOADED_NAMES, after)
+
+    def deleted(sender, instance, **kwargs):
+        release_media(get_names(instance))
+        setattr(instance, _LOADED_NAMES, Counter())
+
+    post_init.connect(remember, sender=model, weak=False, dispatch_uid=uid)
+    post_save.connect(saved, sender=model, weak=False, dispatch_uid=uid)
+    post_delete.connect(deleted, sender=model, weak=False, dispatch_uid=uid)
+
+
+def unreferenced_blobs(grace_seconds):
+    """Blobs nothing has referenced for at least grace_seconds"""
+    cutoff = timezone.now() - timedelta(seconds=grace_seconds)
+    return MediaBlob.objects.filter(refcount__lte=0, updated_at__lt=cutoff)
@@ -0,0 +1,77 @@
+# Generated by Django 4.2.7 on 2026-10-17 19:28
+
+from django.db import migrations, models
+
+BATCH_SIZE = 500
+
+SUMMARY_FIELDS = ['photo_count', 'primary_photo_image', 'completion_percentage', 'is_age_verified']
+
+
+def completion_percentage(profile, photo_count):
+    # Frozen copy of Profile.compute_completion_percentage
+    return (
+        (25 if photo_count else 0) +
+        (10 if profile.age else 0) +
+        (15 if profile.bio else 0) +
+        (15 if profile.hobbies else 0) +
+        (15 if profile.interests else 0) +
+        (10 if profile.favorite_drinks else 0) +
+        (10 if profile.favorite_food else 0)
+    )
+
+
+def fill_profile_summaries(apps, schema_editor):
+    Profile = apps.get_model('users', 'Profile')
+    AgeVerification = apps.get_model('users', 'AgeVerification')
+    verified = set(
+        AgeVerification.objects.filter(status='approved').values_list('user_id', flat=True)
+    )
+    ProfilePhoto = apps.get_model('users', 'ProfilePhoto')
+    profiles = Profile.objects.order_by('pk').prefetch_related(
+        models.Prefetch('photos', queryset=ProfilePhoto.objects.order_by('order'))
+    )
+    batch = []
+    for profile in profiles.iterator(chunk_size=BATCH_SIZE):
+        photos = list(profile.photos.all())
+        primary = next((photo for photo in photos if photo.is_primary), photos[0] if photos else None)
+        profile.photo_count = len(photos)
+        profile.primary_photo_image = primary.image.name if primary else ''
+        profile.completion_percentage = completion_percentage(profile, len(photos))
+        profile.is_age_verified = profile.user_id in verified
+        batch.append(profile)
+        if len(batch) >= BATCH_SIZE:
+            Profile.objects.bulk_update(batch, SUMMARY_FIELDS)
+            batch = []
+    if batch:
+        Profile.objects.bulk_update(batch, SUMMARY_FIELDS)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0006_mediablob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='profile',
+            name='completion_percentage',
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='profile',
+            name='is_age_verified',
+            field=models.BooleanField(default=False, editable=False),
+        ),
+        migrations.AddField(
+            model_name='profile',
+            name='photo_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='profile',
+            name='primary_photo_image',
+            field=models.ImageField(blank=True, editable=False, max_length=255, upload_to=''),
+        ),
+        migrations.RunPython(fill_profile_summaries, migrations.RunPython.noop),
+    ]
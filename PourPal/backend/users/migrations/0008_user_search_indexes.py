@@ -0,0 +1,41 @@
+from django.db import migrations
+
+# Postgres only; SQLite searches an in-memory index (see users.search).
+# The "C"-collated b-trees serve ordered prefix scans, the trigram GINs
+# serve LIKE '%q%'. Both are on lower() to match the search queries.
+POSTGRES_FORWARD = [
+    'CREATE EXTENSION IF NOT EXISTS pg_trgm',
+    'CREATE INDEX users_user_username_prefix_idx ON users_user (lower(username) COLLATE "C")',
+    'CREATE INDEX users_user_first_name_prefix_idx ON users_user (lower(first_name) COLLATE "C")',
+    'CREATE INDEX users_user_username_trgm_idx ON users_user USING GIN (lower(username) gin_trgm_ops)',
+    'CREATE INDEX users_user_first_name_trgm_idx ON users_user USING GIN (lower(first_name) gin_trgm_ops)',
+]
+
+# The extension is left installed; other schemas may rely on it
+POSTGRES_REVERSE = [
+    'DROP INDEX IF EXISTS users_user_first_name_trgm_idx',
+    'DROP INDEX IF EXISTS users_user_username_trgm_idx',
+    'DROP INDEX IF EXISTS users_user_first_name_prefix_idx',
+    'DROP INDEX IF EXISTS users_user_username_prefix_idx',
+]
+
+
+def _run(statements_by_vendor):
+    def run(apps, schema_editor):
+        for statement in statements_by_vendor.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(statement)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0007_profile_summary_columns'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            _run({'postgresql': POSTGRES_FORWARD}),
+            _run({'postgresql': POSTGRES_REVERSE}),
+        ),
+    ]
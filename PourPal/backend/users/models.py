@@ -78,38 +78,25 @@ class Profile(models.Model):
     linkedin = models.URLField(max_length=200, blank=True, null=True)
     snapchat = models.CharField(max_length=100, blank=True, null=True, help_text="Snapchat username")
     
+    # Summary columns, kept up to date by the signals in users.signals so
+    # serializing a profile needs no extra queries
+    photo_count = models.PositiveIntegerField(default=0, editable=False)
+    primary_photo_image = models.ImageField(max_length=255, blank=True, editable=False)
+    completion_percentage = models.PositiveSmallIntegerField(default=0, editable=False)
+    is_age_verified = models.BooleanField(default=False, editable=False)
+    
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
     def __str__(self):
         return f"{self.user.first_name}'s Profile"
     
-    @property
-    def photo_count(self):
-        """Return the number of photos"""
-        return self.photos.count()
-    
-    @property
-    def primary_photo(self):
-        """Return the primary photo or the first photo"""
-        try:
-            # Try to get the primary photo
-            primary = self.photos.filter(is_primary=True).first()
-            if primary:
-                return primary
-            # If no primary, return the first photo
-            return self.photos.order_by('order').first()
-        except Exception:
-            return None
-    
-    @property
-    def completion_percentage(self):
-        """Calculate profile completion percentage"""
-        total_points = 100
+    def compute_completion_percentage(self):
+        """Calculate profile completion percentage from the stored fields"""
         earned_points = 0
         
         # Photos (25 points)
-        if self.photos.count() > 0:
+        if self.photo_count > 0:
             earned_points += 25
         
         # Age (10 points)
@@ -138,14 +125,22 @@ class Profile(models.Model):
         
         return earned_points
     
-    @property
-    def is_age_verified(self):
-        """Check if user has verified age"""
-        try:
-            return self.user.age_verification.is_verified
-        except:
-            return False
-
+    def refresh_photo_summary(self):
+        """Recount the photos, pick the primary one and store the summary columns"""
+        photos = list(self.photos.order_by('order').values_list('image', 'is_primary'))
+        primary = next((image for image, is_primary in photos if is_primary), None)
+        if primary is None and photos:
+            primary = photos[0][0]
+        
+        self.photo_count = len(photos)
+        self.primary_photo_image = primary or ''
+        self.completion_percentage = self.compute_completion_percentage()
+        # update() so the profile's own save signals and updated_at stay untouched
+        Profile.objects.filter(pk=self.pk).update(
+            photo_count=self.photo_count,
+            primary_photo_image=self.primary_photo_image,
+            completion_percentage=self.completion_percentage,
+        )
 
 
 class ProfilePhoto(models.Model):
@@ -359,19 +354,58 @@ class Connection(models.Model):
     
     @classmethod
     def are_friends(cls, user1, user2):
-        return cls.objects.filter(
-            models.Q(user=user1, friend=user2, status='accepted') |
-            models.Q(user=user2, friend=user1, status='accepted')
-        ).exists()
+        """Accepts users or ids; served from the cached friend sets in users.friends"""
+        from .friends import are_friends
+        return are_friends(getattr(user1, 'pk', user1), getattr(user2, 'pk', user2))
+    
+    @classmethod
+    def get_connection_statuses(cls, user, user_ids):
+        """
+        Resolve the connection between user and each of user_ids with one
+        query. Returns {user_id: {'status', 'direction', 'connection_id'}};
+        a request the user sent wins over one they received, as in
+        get_connection_status.
+        """
+        statuses = {
+            user_id: {'status': 'none', 'direction': None, 'connection_id': None}
+            for user_id in user_ids
+        }
+        connections = cls.objects.filter(
+            models.Q(user=user, friend_id__in=user_ids) |
+            models.Q(friend=user, user_id__in=user_ids)
+        ).values_list('id', 'user_id', 'friend_id', 'status')
+        for connection_id, sender_id, receiver_id, status in connections:
+            if sender_id == user.pk:
+                other_id, direction = receiver_id, 'sent'
+            else:
+                other_id, direction = sender_id, 'received'
+            if statuses[other_id]['direction'] == 'sent':
+                continue
+            statuses[other_id] = {'status': status, 'direction': direction, 'connection_id': connection_id}
+        return statuses
     
     @classmethod
     def get_connection_status(cls, user1, user2):
-        sent = cls.objects.filter(user=user1, friend=user2).first()
-        if sent:
-            return {'status': sent.status, 'direction': 'sent', 'connection_id': sent.id}
-        
-        received = cls.objects.filter(user=user2, friend=user1).first()
-        if received:
-            return {'status': received.status, 'direction': 'received', 'connection_id': received.id}
-        
-        return {'status': 'none', 'direction': None, 'connection_id': None}
+        return cls.get_connection_statuses(user1, [user2.pk])[user2.pk]
+
+
+class MediaBlob(models.Model):
+    """
+    A file kept once by the content-addressed storage, however many rows
+    use it. refcount counts the referencing rows; blobs left unreferenced
+    are removed by the collect_media_blobs command after a grace period.
+    """
+    name = models.CharField(max_length=255, unique=True)
+    digest = models.CharField(max_length=64, db_index=True)
+    size = models.PositiveBigIntegerField()
+    refcount = models.IntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=['refcount', 'updated_at']),
+        ]
+    
+    def __str__(self):
+        return f"{self.name} ({self.refcount} refs)"
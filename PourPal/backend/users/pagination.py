@@ -0,0 +1,75 @@
+import base64
+import json
+from bisect import bisect_right
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class FriendIndexPagination(BasePagination):
+    """
+    Cursor pagination over a cached friend index sorted by (sort_key, id).
+
+    The cursor encodes the key of the last entry and the next page starts
+    right after it with a binary search, so friends added or removed
+    between requests never shift or duplicate entries.
+    """
+    page_size = 50
+    max_page_size = 200
+    page_size_query_param = 'page_size'
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return max(1, min(page_size, self.max_page_size))
+
+    def encode_cursor(self, entry):
+        payload = json.dumps([entry.sort_key, entry.id]).encode()
+        return base64.urlsafe_b64encode(payload).decode().rstrip('=')
+
+    def decode_cursor(self, token):
+        try:
+            padded = token + '=' * (-len(token) % 4)
+            sort_key, pk = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            return str(sort_key), int(pk)
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def paginate_queryset(self, entries, request, view=None):
+        self.request = request
+        self.count = len(entries)
+        start = 0
+        token = request.query_params.get(self.cursor_query_param)
+        if token:
+            # bisect only takes key= from Python 3.10; production runs 3.9
+            keys = [(entry.sort_key, entry.id) for entry in entries]
+            start = bisect_right(keys, self.decode_cursor(token))
+        page_size = self.get_page_size(request)
+        self.has_next = len(entries) > start + page_size
+        self.page = entries[start:start + page_size]
+        return self.page
+
+    def get_next_cursor(self):
+        if not self.has_next:
+            return None
+        return self.encode_cursor(self.page[-1])
+
+    def get_next_link(self):
+        cursor = self.get_next_cursor()
+        if cursor is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def get_paginated_response(self, data):
+        return Response({
+            'count': self.count,
+            'next': self.get_next_link(),
+            'next_cursor': self.get_next_cursor(),
+            'results': data,
+        })
@@ -0,0 +1,193 @@
+"""
+User search by username and first name.
+
+Results rank exact matches first, then prefix matches, then names that
+merely contain the query. Each stage stops as soon as it has enough users,
+so a short, common query costs no more than a rare one.
+
+Postgres answers from expression indexes created by migration 0008: a
+b-tree on lower(column) COLLATE "C" per column for the ordered prefix scan
+and a pg_trgm GIN per column for the contains scan. SQLite has neither, so a
+process-local sorted list of names stands in for the b-trees and the contains
+stage, which only runs when prefixes are not enough, scans the table.
+"""
+import threading
+import time
+from bisect import bisect_left
+from django.conf import settings
+from django.db import connection, models
+from django.db.models.expressions import RawSQL
+from .models import User
+
+SEARCH_LIMIT = 10
+
+# Columns searched; saves that touch neither leave the index fresh
+SEARCH_FIELDS = ('username', 'first_name')
+
+# See NearestHangoutIndex: other processes' writes show up after this long
+DEFAULT_MAX_AGE_SECONDS = 60
+
+EXACT, PREFIX, CONTAINS = 0, 1, 2
+
+
+def escape_like(value):
+    return value.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
+def _take(ranked, limit):
+    """Keep the first limit distinct user ids from (rank, name, id) tuples"""
+    user_ids = []
+    for _, _, user_id in sorted(ranked):
+        if user_id not in user_ids:
+            user_ids.append(user_id)
+    return user_ids[:limit]
+
+
+class UserSearchIndex:
+    """
+    Process-local sorted list of (name, user_id), one entry per searched
+    column. The prefix matches for a query, exact ones first, are a
+    contiguous run starting at its bisect position. Refreshed like
+    NearestHangoutIndex.
+    """
+
+    def __init__(self):
+        self._snapshot = None  # (names, version, built_at)
+        self._version = 0
+        self._rebuild_lock = threading.Lock()
+
+    def mark_stale(self):
+        self._version += 1
+
+    def _is_fresh(self, snapshot):
+        version, built_at = snapshot[1:]
+        max_age = getattr(settings, 'USER_SEARCH_INDEX_MAX_AGE', DEFAULT_MAX_AGE_SECONDS)
+        return version == self._version and time.monotonic() - built_at < max_age
+
+    def _rebuild(self):
+        version = self._version
+        names = []
+        rows = User.objects.values_list('id', *SEARCH_FIELDS)
+        for user_id, *fields in rows.iterator():
+            for name in {field.casefold() for field in fields if field}:
+                names.append((name, user_id))
+        names.sort()
+        self._snapshot = (names, version, time.monotonic())
+        return self._snapshot
+
+    def get_snapshot(self):
+        snapshot = self._snapshot
+        if snapshot is not None and self._is_fresh(snapshot):
+            return snapshot
+
+        if snapshot is None:
+            with self._rebuild_lock:
+                if self._snapshot is None:
+                    return self._rebuild()
+                return self._snapshot
+
+        if self._rebuild_lock.acquire(blocking=False):
+            try:
+                return self._rebuild()
+            finally:
+                self._rebuild_lock.release()
+        return snapshot
+
+    @staticmethod
+    def _scan(entries, query, exclude_id, limit):
+        """Yield (key, user_id) for entries starting with query, at most limit users"""
+        seen = set()
+        position = bisect_left(entries, (query,))
+        while position < len(entries) and len(seen) < limit:
+            key, user_id = entries[position]
+            if not key.startswith(query):
+                break
+            if user_id != exclude_id and user_id not in seen:
+                seen.add(user_id)
+                yield key, user_id
+            position += 1
+
+    def search(self, query, exclude_id=None, limit=SEARCH_LIMIT):
+        """Return up to limit ids of users with a name starting with query, exact matches first"""
+        names = self.get_snapshot()[0]
+        query = query.casefold()
+        ranked = [
+            (EXACT if name == query else PREFIX, name, user_id)
+            for name, user_id in self._scan(names, query, exclude_id, limit)
+        ]
+        return _take(ranked, limit)
+
+
+user_search_index = UserSearchIndex()
+
+
+def _sqlite_search(query, exclude_id, limit):
+    user_ids = user_search_index.search(query, exclude_id, limit)
+    if len(user_ids) < limit:
+        # No index serves infix matches; an unordered scan is fine as
+        # contains matches come in no particular order on Postgres either
+        matches = User.objects.exclude(id=exclude_id).exclude(id__in=user_ids).filter(
+            models.Q(username__icontains=query) | models.Q(first_name__icontains=query)
+        ).values_list('id', flat=True)[:limit - len(user_ids)]
+        user_ids.extend(matches)
+    return user_ids
+
+
+def _postgres_search(query, exclude_id, limit):
+    query = query.lower()
+    users = User.objects.exclude(id=exclude_id)
+    ranked = []
+    for field in SEARCH_FIELDS:
+        # The "C" collation lets the b-tree serve both LIKE 'q%' and the
+        # ordering, so the scan stops after limit rows
+        column = f'lower(users_user.{field}) COLLATE "C"'
+        matches = users.filter(
+            RawSQL(f'{column} LIKE %s', [escape_like(query) + '%'], output_field=models.BooleanField())
+        ).annotate(
+            key=RawSQL(column, [], output_field=models.CharField())
+        ).order_by('key').values_list('key', 'id')[:limit]
+        ranked.extend(
+            (EXACT if key == query else PREFIX, key, user_id) for key, user_id in matches
+        )
+    user_ids = _take(ranked, limit)
+
+    if len(user_ids) < limit:
+        # Trigram GIN scan; contains matches come in no particular order
+        pattern = '%' + escape_like(query) + '%'
+        matches = users.exclude(id__in=user_ids).filter(
+            RawSQL(
+                'lower(users_user.username) LIKE %s OR lower(users_user.first_name) LIKE %s',
+                [pattern, pattern],
+                output_field=models.BooleanField()
+            )
+        ).values_list('id', flat=True)[:limit - len(user_ids)]
+        user_ids.extend(matches)
+    return user_ids
+
+
+def _fallback_search(query, exclude_id, limit):
+    matches = User.objects.exclude(id=exclude_id).filter(
+        models.Q(username__icontains=query) | models.Q(first_name__icontains=query)
+    ).annotate(
+        search_rank=models.Case(
+            models.When(models.Q(username__iexact=query) | models.Q(first_name__iexact=query), then=EXACT),
+            models.When(models.Q(username__istartswith=query) | models.Q(first_name__istartswith=query), then=PREFIX),
+            default=CONTAINS,
+        )
+    ).order_by('search_rank', 'username')
+    return list(matches.values_list('id', flat=True)[:limit])
+
+
+def search_users(query, exclude_id=None, limit=SEARCH_LIMIT):
+    """Users whose username or first name contains query, best matches first"""
+    query = query.strip()
+    if not query:
+        return []
+    if connection.vendor == 'sqlite':
+        user_ids = _sqlite_search(query, exclude_id, limit)
+    elif connection.vendor == 'postgresql':
+        user_ids = _postgres_search(query, exclude_id, limit)
+    else:
+        user_ids = _fallback_search(query, exclude_id, limit)
+    users = User.objects.in_bulk(user_ids)
+    return [users[user_id] for user_id in user_ids if user_id in users]
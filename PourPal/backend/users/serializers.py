@@ -1,5 +1,6 @@
 import re
 from rest_framework import serializers
+from django.core.files.storage import default_storage
 from django.core.validators import validate_email
 from django.core.exceptions import ValidationError as DjangoValidationError
 from .models import User, Profile, ProfilePhoto, AgeVerification, Report, Connection, PREDEFINED_HOBBIES
@@ -23,6 +24,16 @@ class ProfilePhotoSerializer(serializers.ModelSerializer):
         return None
 
 
+def photo_url(image, request=None):
+    """Absolute URL of a stored image or image name, or None when there is none"""
+    if not image:
+        return None
+    url = image.url if hasattr(image, 'url') else default_storage.url(image)
+    if request:
+        return request.build_absolute_uri(url)
+    return url
+
+
 class ProfileSerializer(serializers.ModelSerializer):
     """Serializer for user profile with all fields"""
     photos = ProfilePhotoSerializer(many=True, read_only=True)
@@ -44,13 +55,7 @@ class ProfileSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at', 'updated_at']
     
     def get_primary_photo_url(self, obj):
-        primary = obj.primary_photo
-        if primary and primary.image:
-            request = self.context.get('request')
-            if request:
-                return request.build_absolute_uri(primary.image.url)
-            return primary.image.url
-        return None
+        return photo_url(obj.primary_photo_image, self.context.get('request'))
     
     def get_predefined_hobbies(self, obj):
         """Return list of predefined hobbies for selection"""
@@ -79,6 +84,23 @@ class UserSerializer(serializers.ModelSerializer):
         read_only_fields = ['id']
 
 
+class UserSummarySerializer(serializers.ModelSerializer):
+    """Compact user representation for lists (id, name and avatar only)"""
+    avatar_url = serializers.SerializerMethodField()
+    
+    class Meta:
+        model = User
+        fields = ['id', 'username', 'first_name', 'avatar_url']
+        read_only_fields = fields
+    
+    def get_avatar_url(self, obj):
+        try:
+            profile = obj.profile
+        except Profile.DoesNotExist:
+            return None
+        return photo_url(profile.primary_photo_image, self.context.get('request'))
+
+
 class UserRegistrationSerializer(serializers.ModelSerializer):
     """Serializer for user registration with password and email validation"""
     password = serializers.CharField(write_only=True, min_length=8)
@@ -232,13 +254,19 @@ class PublicProfileSerializer(serializers.ModelSerializer):
         ]
     
     def get_primary_photo_url(self, obj):
-        primary = obj.primary_photo
-        if primary and primary.image:
-            request = self.context.get('request')
-            if request:
-                return request.build_absolute_uri(primary.image.url)
-            return primary.image.url
-        return None
+        return photo_url(obj.primary_photo_image, self.context.get('request'))
+
+
+class FriendSerializer(serializers.Serializer):
+    """A friend from the cached friend index (see users.friends)"""
+    id = serializers.IntegerField()
+    first_name = serializers.CharField()
+    username = serializers.CharField()
+    connection_id = serializers.IntegerField()
+    avatar_url = serializers.SerializerMethodField()
+    
+    def get_avatar_url(self, obj):
+        return photo_url(obj.avatar, self.context.get('request'))
 
 
 class ConnectionSerializer(serializers.ModelSerializer):
@@ -261,6 +289,10 @@ class UserSearchSerializer(serializers.ModelSerializer):
         fields = ['id', 'first_name', 'username', 'connection_status']
     
     def get_connection_status(self, obj):
+        # Views listing many users resolve the statuses up front in one query
+        statuses = self.context.get('connection_statuses')
+        if statuses is not None and obj.id in statuses:
+            return statuses[obj.id]
         request = self.context.get('request')
         if request and request.user.is_authenticated:
             return Connection.get_connection_status(request.user, obj)
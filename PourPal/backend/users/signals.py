@@ -0,0 +1,74 @@
+from django.db import transaction
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+from .friends import invalidate_friend_display, invalidate_friend_ids
+from .media import file_name, track_media_references
+from .models import AgeVerification, Connection, Profile, ProfilePhoto, User
+from .search import SEARCH_FIELDS, user_search_index
+
+
+@receiver(post_save, sender=Connection)
+@receiver(post_delete, sender=Connection)
+def invalidate_cached_friends(sender, instance, **kwargs):
+    """Drop both users' cached friend sets when a connection is accepted or removed"""
+    user_ids = (instance.user_id, instance.friend_id)
+    # Wait for the commit so a concurrent reader cannot re-cache the old set
+    transaction.on_commit(lambda: invalidate_friend_ids(*user_ids))
+
+
+# Profile photos and ID documents share deduplicated blobs
+track_media_references(ProfilePhoto, lambda photo: [file_name(photo, 'image')])
+track_media_references(AgeVerification, lambda verification: [file_name(verification, 'document')])
+
+
+# User fields shown in friend lists
+FRIEND_DISPLAY_FIELDS = {'first_name', 'username'}
+
+
+@receiver(post_save, sender=User)
+def invalidate_friend_display_on_rename(sender, instance, created, update_fields, **kwargs):
+    """Drop the friend indexes showing a user whose name may have changed"""
+    if created or (update_fields and not FRIEND_DISPLAY_FIELDS & set(update_fields)):
+        # Logins only save last_login
+        return
+    user_id = instance.pk
+    transaction.on_commit(lambda: invalidate_friend_display(user_id))
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def mark_user_search_stale(sender, update_fields=None, **kwargs):
+    """Rebuild the in-memory user search index on its next read"""
+    if update_fields and not set(SEARCH_FIELDS) & set(update_fields):
+        return
+    user_search_index.mark_stale()
+
+
+@receiver(pre_save, sender=Profile)
+def update_profile_completion(sender, instance, **kwargs):
+    """Score the profile from its own fields; photo_count is kept by the photo signals"""
+    if instance._state.adding:
+        instance.is_age_verified = AgeVerification.objects.filter(
+            user_id=instance.user_id, status='approved'
+        ).exists()
+    instance.completion_percentage = instance.compute_completion_percentage()
+
+
+@receiver(post_save, sender=ProfilePhoto)
+@receiver(post_delete, sender=ProfilePhoto)
+def update_profile_photo_summary(sender, instance, **kwargs):
+    """Refresh photo_count, the primary photo and completion after a photo change"""
+    profile = Profile.objects.filter(pk=instance.profile_id).first()
+    if profile is not None:
+        profile.refresh_photo_summary()
+        # Friend lists show the avatar
+        user_id = profile.user_id
+        transaction.on_commit(lambda: invalidate_friend_display(user_id))
+
+
+@receiver(post_save, sender=AgeVerification)
+@receiver(post_delete, sender=AgeVerification)
+def update_profile_age_verified(sender, instance, signal, **kwargs):
+    """Mirror the verification status on the profile"""
+    is_verified = signal is post_save and instance.is_verified
+    Profile.objects.filter(user_id=instance.user_id).update(is_age_verified=is_verified)
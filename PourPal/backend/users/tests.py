@@ -0,0 +1,63 @@
+from unittest import skipUnless
+from django.db import connection
+from django.test import TestCase
+from .models import User
+from .search import _postgres_search, search_users, user_search_index
+
+
+class UserSearchTests(TestCase):
+    """
+    Exact matches rank first, then prefix matches, then names that merely
+    contain the query, on whichever backend the tests run.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        names = [
+            ('ana', 'Ana'),
+            ('anabela', 'Bela'),
+            ('dragos', 'Anastasia'),
+            ('ioana', 'Ioana'),
+            ('mihai', 'Mihai'),
+        ]
+        cls.users = {
+            username: User.objects.create_user(
+                username=username, email=f'{username}@example.com', password='pass', first_name=first_name
+            )
+            for username, first_name in names
+        }
+
+    def setUp(self):
+        # The SQLite index is process-local and outlives rolled back tests
+        user_search_index.mark_stale()
+
+    def usernames(self, user_ids):
+        by_id = {user.id: username for username, user in self.users.items()}
+        return [by_id[user_id] for user_id in user_ids]
+
+    def assert_ranked(self, user_ids):
+        # Exact, then prefix matches by name; contains matches in any order
+        self.assertEqual(self.usernames(user_ids[:3]), ['ana', 'anabela', 'dragos'])
+        self.assertEqual(self.usernames(user_ids[3:]), ['ioana'])
+
+    def test_ranking(self):
+        self.assert_ranked([user.id for user in search_users('ANA')])
+
+    def test_excludes_user(self):
+        users = search_users('ana', exclude_id=self.users['ana'].id)
+        self.assertNotIn(self.users['ana'], users)
+        self.assertEqual(len(users), 3)
+
+    def test_limit_prefers_better_matches(self):
+        users = search_users('ana', limit=2)
+        self.assertEqual(users, [self.users['ana'], self.users['anabela']])
+
+    def test_like_wildcards_are_literal(self):
+        self.assertEqual(search_users('a%a'), [])
+        self.assertEqual(search_users('_'), [])
+
+    @skipUnless(connection.vendor == 'postgresql', 'needs the Postgres expression indexes')
+    def test_postgres_search(self):
+        # Run the suite with DATABASE_URL pointing at Postgres to cover this
+        self.assert_ranked(_postgres_search('ana', None, 10))
+        self.assertEqual(_postgres_search('ana', None, 2), [self.users['ana'].id, self.users['anabela'].id])
@@ -26,7 +26,8 @@ from .views import (
     PendingRequestsView,
     RemoveConnectionView,
     SearchUsersView,
-    ConnectionStatusView
+    ConnectionStatusView,
+    BulkConnectionStatusView
 )
 from .test_views import test_api
 
@@ -60,6 +61,7 @@ urlpatterns = [
     path('connections/<int:connection_id>/remove/', RemoveConnectionView.as_view(), name='remove-connection'),
     path('connections/friends/', ListFriendsView.as_view(), name='list-friends'),
     path('connections/pending/', PendingRequestsView.as_view(), name='pending-requests'),
+    path('connections/status/', BulkConnectionStatusView.as_view(), name='connection-status-bulk'),
     path('connections/status/<int:user_id>/', ConnectionStatusView.as_view(), name='connection-status'),
     path('search/', SearchUsersView.as_view(), name='search-users'),
 ]
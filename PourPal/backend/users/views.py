@@ -19,8 +19,12 @@ from .serializers import (
     ReportListSerializer,
     PublicProfileSerializer,
     ConnectionSerializer,
+    FriendSerializer,
     UserSearchSerializer
 )
+from .friends import get_friend_index
+from .pagination import FriendIndexPagination
+from .search import search_users
 
 
 @method_decorator(csrf_exempt, name='dispatch')
@@ -508,26 +512,27 @@ class RejectConnectionView(APIView):
 
 @method_decorator(csrf_exempt, name='dispatch')
 class ListFriendsView(APIView):
+    """
+    The user's friends sorted by name, served from the cached friend index
+    with cursor pagination. ?q= keeps names or usernames starting with q,
+    for friend pickers.
+    """
     permission_classes = [permissions.IsAuthenticated]
     
     def get(self, request):
-        # Get accepted connections where user is either sender or receiver
-        connections = Connection.objects.filter(
-            models.Q(user=request.user, status='accepted') | 
-            models.Q(friend=request.user, status='accepted')
-        )
-        
-        friends_data = []
-        for conn in connections:
-            friend = conn.friend if conn.user == request.user else conn.user
-            friends_data.append({
-                'id': friend.id,
-                'first_name': friend.first_name,
-                'username': friend.username,
-                'connection_id': conn.id
-            })
+        friends = get_friend_index(request.user.id)
+        query = request.query_params.get('q', '').strip().casefold()
+        if query:
+            friends = [
+                friend for friend in friends
+                if friend.first_name.casefold().startswith(query)
+                or friend.username.casefold().startswith(query)
+            ]
         
-        return Response(friends_data, status=status.HTTP_200_OK)
+        paginator = FriendIndexPagination()
+        page = paginator.paginate_queryset(friends, request, view=self)
+        serializer = FriendSerializer(page, many=True, context={'request': request})
+        return paginator.get_paginated_response(serializer.data)
 
 
 @method_decorator(csrf_exempt, name='dispatch')
@@ -566,8 +571,11 @@ class SearchUsersView(APIView):
             return Response({'error': 'Search query must be at least 2 characters'}, 
                           status=status.HTTP_400_BAD_REQUEST)
         
-        users = User.objects.filter(username__icontains=query).exclude(id=request.user.id)[:10]
-        serializer = UserSearchSerializer(users, many=True, context={'request': request})
+        users = search_users(query, exclude_id=request.user.id)
+        statuses = Connection.get_connection_statuses(request.user, [user.id for user in users])
+        serializer = UserSearchSerializer(
+            users, many=True, context={'request': request, 'connection_statuses': statuses}
+        )
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
@@ -583,3 +591,28 @@ class ConnectionStatusView(APIView):
         
         status_info = Connection.get_connection_status(request.user, user)
         return Response(status_info, status=status.HTTP_200_OK)
+
+
+# Most user ids resolved by one bulk status request
+MAX_STATUS_IDS = 100
+
+
+@method_decorator(csrf_exempt, name='dispatch')
+class BulkConnectionStatusView(APIView):
+    """Connection status with each user in ?ids=1,2,3, keyed by user id"""
+    permission_classes = [permissions.IsAuthenticated]
+    
+    def get(self, request):
+        try:
+            user_ids = [int(value) for value in request.GET.get('ids', '').split(',') if value.strip()]
+        except ValueError:
+            return Response({'error': 'ids must be a comma-separated list of user ids'},
+                          status=status.HTTP_400_BAD_REQUEST)
+        if not user_ids:
+            return Response({'error': 'ids is required'}, status=status.HTTP_400_BAD_REQUEST)
+        if len(user_ids) > MAX_STATUS_IDS:
+            return Response({'error': f'At most {MAX_STATUS_IDS} ids per request'},
+                          status=status.HTTP_400_BAD_REQUEST)
+        
+        statuses = Connection.get_connection_statuses(request.user, set(user_ids))
+        return Response(statuses, status=status.HTTP_200_OK)
@@ -3,6 +3,27 @@ import axios from 'axios';
 import './ConnectionButton.css';
 import { API_BASE_URL } from '../../services/api';
 
+// Buttons rendered in the same tick share one /connections/status/?ids= request
+let pendingBatch = null;
+
+const loadConnectionStatus = (userId) => {
+    if (!pendingBatch) {
+        const batch = { ids: new Set() };
+        batch.promise = new Promise((resolve, reject) => {
+            setTimeout(() => {
+                pendingBatch = null;
+                axios.get(`${API_BASE_URL}/users/connections/status/`, {
+                    params: { ids: [...batch.ids].join(',') },
+                    withCredentials: true
+                }).then(response => resolve(response.data), reject);
+            }, 0);
+        });
+        pendingBatch = batch;
+    }
+    pendingBatch.ids.add(userId);
+    return pendingBatch.promise.then(statuses => statuses[userId]);
+};
+
 const ConnectionButton = ({ userId, userName }) => {
     const [connectionStatus, setConnectionStatus] = useState(null);
     const [loading, setLoading] = useState(true);
@@ -13,10 +34,7 @@ const ConnectionButton = ({ userId, userName }) => {
 
     const fetchConnectionStatus = async () => {
         try {
-            const response = await axios.get(`${API_BASE_URL}/users/connections/status/${userId}/`, {
-                withCredentials: true
-            });
-            setConnectionStatus(response.data);
+            setConnectionStatus(await loadConnectionStatus(userId));
             setLoading(false);
         } catch (err) {
             console.error('Error fetching connection status:', err);
@@ -6,6 +6,9 @@ import { API_BASE_URL } from '../../services/api';
 
 const FriendsPage = () => {
     const [friends, setFriends] = useState([]);
+    const [friendCount, setFriendCount] = useState(0);
+    const [friendsCursor, setFriendsCursor] = useState(null);
+    const [loadingMoreFriends, setLoadingMoreFriends] = useState(false);
     const [pendingRequests, setPendingRequests] = useState([]);
     const [searchQuery, setSearchQuery] = useState('');
     const [searchResults, setSearchResults] = useState([]);
@@ -23,7 +26,9 @@ const FriendsPage = () => {
             const response = await axios.get(`${API_BASE_URL}/users/connections/friends/`, {
                 withCredentials: true
             });
-            setFriends(response.data);
+            setFriends(response.data.results);
+            setFriendCount(response.data.count);
+            setFriendsCursor(response.data.next_cursor);
             setLoading(false);
         } catch (err) {
             console.error('Error fetching friends:', err);
@@ -31,6 +36,23 @@ const FriendsPage = () => {
         }
     };
 
+    const loadMoreFriends = async () => {
+        setLoadingMoreFriends(true);
+        try {
+            const response = await axios.get(`${API_BASE_URL}/users/connections/friends/`, {
+                params: { cursor: friendsCursor },
+                withCredentials: true
+            });
+            setFriends(prev => [...prev, ...response.data.results]);
+            setFriendCount(response.data.count);
+            setFriendsCursor(response.data.next_cursor);
+        } catch (err) {
+            console.error('Error loading more friends:', err);
+        } finally {
+            setLoadingMoreFriends(false);
+        }
+    };
+
     const fetchPendingRequests = async () => {
         try {
             const response = await axios.get(`${API_BASE_URL}/users/connections/pending/`, {
@@ -189,7 +211,7 @@ const FriendsPage = () => {
 
             {/* Friends List */}
             <div className="friends-section">
-                <h2>✨ My Friends ({friends.length})</h2>
+                <h2>✨ My Friends ({friendCount})</h2>
                 {friends.length === 0 ? (
                     <p className="no-friends">No friends yet. Search for users above to add friends!</p>
                 ) : (
@@ -211,6 +233,17 @@ const FriendsPage = () => {
                         ))}
                     </div>
                 )}
+                {friendsCursor && (
+                    <div className="load-more">
+                        <button
+                            className="btn-add"
+                            onClick={loadMoreFriends}
+                            disabled={loadingMoreFriends}
+                        >
+                            {loadingMoreFriends ? 'Loading...' : 'Load more'}
+                        </button>
+                    </div>
+                )}
             </div>
         </div>
     );
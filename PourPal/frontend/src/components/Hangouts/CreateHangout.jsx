@@ -13,6 +13,9 @@ const CreateHangout = () => {
     const [error, setError] = useState('');
     const [success, setSuccess] = useState('');
     const [friends, setFriends] = useState([]);
+    const [hasFriends, setHasFriends] = useState(false);
+    const [friendQuery, setFriendQuery] = useState('');
+    const [friendsCursor, setFriendsCursor] = useState(null);
     const [selectedFriends, setSelectedFriends] = useState([]);
 
     const [formData, setFormData] = useState({
@@ -27,15 +30,23 @@ const CreateHangout = () => {
     });
 
     useEffect(() => {
-        fetchFriends();
-    }, []);
+        // Debounce the picker filter; the first run loads the first page
+        const timer = setTimeout(() => fetchFriends(friendQuery), friendQuery ? 250 : 0);
+        return () => clearTimeout(timer);
+    }, [friendQuery]);
 
-    const fetchFriends = async () => {
+    const fetchFriends = async (query = '', cursor = null) => {
         try {
             const response = await axios.get(`${API_BASE_URL}/users/connections/friends/`, {
+                params: { q: query || undefined, cursor: cursor || undefined },
                 withCredentials: true
             });
-            setFriends(response.data);
+            const { results, count, next_cursor } = response.data;
+            setFriends(prev => (cursor ? [...prev, ...results] : results));
+            setFriendsCursor(next_cursor);
+            if (!query && !cursor) {
+                setHasFriends(count > 0);
+            }
         } catch (err) {
             console.error('Error fetching friends:', err);
         }
@@ -242,12 +253,19 @@ const CreateHangout = () => {
                     </div>
 
                     {/* Invite Friends */}
-                    {friends.length > 0 && (
+                    {hasFriends && (
                         <div className="form-section">
                             <label>
                                 <span className="label-icon">👥</span>
                                 Invite Friends (Optional)
                             </label>
+                            <input
+                                type="text"
+                                className="friend-filter"
+                                placeholder="Filter friends by name"
+                                value={friendQuery}
+                                onChange={(e) => setFriendQuery(e.target.value)}
+                            />
                             <div className="friends-selector">
                                 {friends.map(friend => (
                                     <div
@@ -259,6 +277,14 @@ const CreateHangout = () => {
                                         {selectedFriends.includes(friend.id) && <span className="check-icon">✓</span>}
                                     </div>
                                 ))}
+                                {friendsCursor && (
+                                    <div
+                                        className="friend-chip"
+                                        onClick={() => fetchFriends(friendQuery, friendsCursor)}
+                                    >
+                                        <span>More…</span>
+                                    </div>
+                                )}
                             </div>
                             {selectedFriends.length > 0 && (
                                 <small className="friend-count">
@@ -26,23 +26,35 @@ const HangoutList = () => {
     const [loading, setLoading] = useState(true);
     const [error, setError] = useState(null);
     const [activeFilters, setActiveFilters] = useState({});
+    const [nextCursor, setNextCursor] = useState(null);
+    const [loadingMore, setLoadingMore] = useState(false);
+
+    const buildParams = (filters) => {
+        // Combine category filter with advanced filters
+        const params = { ...filters };
+        if (selectedCategory !== 'all') {
+            params.category = selectedCategory;
+        }
+        // Date filters are calendar days in the user's timezone
+        if (params.startDate || params.endDate) {
+            params.tz = Intl.DateTimeFormat().resolvedOptions().timeZone;
+        }
+        return params;
+    };
 
     const fetchHangouts = async (filters = {}) => {
         setLoading(true);
         try {
-            // Combine category filter with advanced filters
-            const params = { ...filters };
-            if (selectedCategory !== 'all') {
-                params.category = selectedCategory;
-            }
+            const params = buildParams(filters);
 
             const [hangoutsRes, recommendedRes] = await Promise.all([
                 getHangouts(params),
                 axios.get(`${API_BASE_URL}/hangouts/recommended/`, { withCredentials: true })
             ]);
 
-            setHangouts(hangoutsRes.data);
-            setFilteredHangouts(hangoutsRes.data);
+            setHangouts(hangoutsRes.data.results);
+            setFilteredHangouts(hangoutsRes.data.results);
+            setNextCursor(hangoutsRes.data.next_cursor);
             setRecommendedHangouts(recommendedRes.data.recommended || []);
             setRecommendationMessage(recommendedRes.data.message || '');
         } catch (err) {
@@ -53,6 +65,22 @@ const HangoutList = () => {
         }
     };
 
+    const loadMoreHangouts = async () => {
+        setLoadingMore(true);
+        try {
+            const params = { ...buildParams(activeFilters), cursor: nextCursor };
+            const res = await getHangouts(params);
+            setHangouts(prev => [...prev, ...res.data.results]);
+            setFilteredHangouts(prev => [...prev, ...res.data.results]);
+            setNextCursor(res.data.next_cursor);
+        } catch (err) {
+            console.error("Error loading more hangouts:", err);
+            setError(err);
+        } finally {
+            setLoadingMore(false);
+        }
+    };
+
     useEffect(() => {
         fetchHangouts(activeFilters);
     }, [selectedCategory]); // Re-fetch when category changes
@@ -215,6 +243,18 @@ const HangoutList = () => {
                     })}
                 </div>
             )}
+
+            {nextCursor && (
+                <div className="load-more">
+                    <button
+                        className="category-btn"
+                        onClick={loadMoreHangouts}
+                        disabled={loadingMore}
+                    >
+                        {loadingMore ? 'Loading...' : 'Load more hangouts'}
+                    </button>
+                </div>
+            )}
         </div>
     );
 };
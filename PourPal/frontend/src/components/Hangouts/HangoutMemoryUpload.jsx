@@ -146,14 +146,24 @@ const HangoutMemoryUpload = ({ hangoutId, isParticipant }) => {
                 <div className="memory-grid">
                     {memories.map((memory) => (
                         <div key={memory.id} className="memory-card">
-                            <img
-                                src={memory.image_url || memory.image}
-                                alt={memory.caption || 'Memory photo'}
-                                onError={(e) => {
-                                    console.error('Image failed to load:', memory);
-                                    e.target.src = 'data:image/svg+xml,%3Csvg xmlns="http://www.w3.org/2000/svg" width="200" height="200"%3E%3Crect fill="%23ddd" width="200" height="200"/%3E%3Ctext fill="%23999" x="50%25" y="50%25" text-anchor="middle" dy=".3em"%3EImage not found%3C/text%3E%3C/svg%3E';
-                                }}
-                            />
+                            <picture>
+                                {/* Resized copies once rendered; the original until then */}
+                                {memory.renditions?.thumb && (
+                                    <source
+                                        type="image/webp"
+                                        srcSet={`${memory.renditions.thumb.webp} 320w, ${memory.renditions.medium.webp} 1080w`}
+                                        sizes="(max-width: 600px) 100vw, 320px"
+                                    />
+                                )}
+                                <img
+                                    src={memory.renditions?.thumb?.jpeg || memory.image_url || memory.image}
+                                    alt={memory.caption || 'Memory photo'}
+                                    onError={(e) => {
+                                        console.error('Image failed to load:', memory);
+                                        e.target.src = 'data:image/svg+xml,%3Csvg xmlns="http://www.w3.org/2000/svg" width="200" height="200"%3E%3Crect fill="%23ddd" width="200" height="200"/%3E%3Ctext fill="%23999" x="50%25" y="50%25" text-anchor="middle" dy=".3em"%3EImage not found%3C/text%3E%3C/svg%3E';
+                                    }}
+                                />
+                            </picture>
                             {memory.caption && (
                                 <p className="memory-caption">{memory.caption}</p>
                             )}
@@ -19,6 +19,8 @@ const UserProfile = () => {
     const [profile, setProfile] = useState(null);
     const [photos, setPhotos] = useState([]);
     const [hangouts, setHangouts] = useState({ upcoming: [], past: [] });
+    const [hangoutCursors, setHangoutCursors] = useState({ upcoming: null, past: null });
+    const [loadingMoreHangouts, setLoadingMoreHangouts] = useState(false);
     const [activeHangoutTab, setActiveHangoutTab] = useState('upcoming');
     const [loading, setLoading] = useState(true);
     const [saving, setSaving] = useState(false);
@@ -92,11 +94,38 @@ const UserProfile = () => {
                 upcoming: response.data.upcoming || [],
                 past: response.data.past || []
             });
+            setHangoutCursors({
+                upcoming: response.data.upcoming_next_cursor,
+                past: response.data.past_next_cursor
+            });
         } catch (err) {
             console.error('Error fetching hangouts:', err);
         }
     };
 
+    const loadMoreMyHangouts = async (section) => {
+        setLoadingMoreHangouts(true);
+        try {
+            // Each side pages with its own cursor
+            const response = await axios.get(`${API_BASE_URL}/hangouts/my-hangouts/`, {
+                params: { section, [`${section}_cursor`]: hangoutCursors[section] },
+                withCredentials: true
+            });
+            setHangouts(prev => ({
+                ...prev,
+                [section]: [...prev[section], ...(response.data[section] || [])]
+            }));
+            setHangoutCursors(prev => ({
+                ...prev,
+                [section]: response.data[`${section}_next_cursor`]
+            }));
+        } catch (err) {
+            console.error('Error loading more hangouts:', err);
+        } finally {
+            setLoadingMoreHangouts(false);
+        }
+    };
+
     const handleInputChange = (e) => {
         const { name, value } = e.target;
         setFormData(prev => ({ ...prev, [name]: value }));
@@ -659,13 +688,13 @@ const UserProfile = () => {
                         className={`tab-btn ${activeHangoutTab === 'upcoming' ? 'active' : ''}`}
                         onClick={() => setActiveHangoutTab('upcoming')}
                     >
-                        Upcoming ({hangouts.upcoming.length})
+                        Upcoming ({hangouts.upcoming.length}{hangoutCursors.upcoming ? '+' : ''})
                     </button>
                     <button
                         className={`tab-btn ${activeHangoutTab === 'past' ? 'active' : ''}`}
                         onClick={() => setActiveHangoutTab('past')}
                     >
-                        Past ({hangouts.past.length})
+                        Past ({hangouts.past.length}{hangoutCursors.past ? '+' : ''})
                     </button>
                 </div>
 
@@ -690,7 +719,7 @@ const UserProfile = () => {
                                     <span className="ended-badge-mini">Ended</span>
                                 )}
                             </div>
-                            <p className="my-hangout-desc">{hangout.description}</p>
+                            <p className="my-hangout-desc">{hangout.summary}</p>
                             <div className="my-hangout-info">
                                 <span>📅 {new Date(hangout.date_time).toLocaleDateString()}</span>
                                 <span>📍 {hangout.venue_location}</span>
@@ -699,6 +728,18 @@ const UserProfile = () => {
                         </a>
                     ))}
                 </div>
+
+                {hangoutCursors[activeHangoutTab] && (
+                    <div className="load-more">
+                        <button
+                            className="tab-btn"
+                            onClick={() => loadMoreMyHangouts(activeHangoutTab)}
+                            disabled={loadingMoreHangouts}
+                        >
+                            {loadingMoreHangouts ? 'Loading...' : 'Load more'}
+                        </button>
+                    </div>
+                )}
             </div>
 
             {/* Save Button */}